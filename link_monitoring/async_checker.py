@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+import aiohttp
+import pandas as pd
+
+from process_data import (
+    config, classify_http_response, time_logger, write_results,
+    REQUEST_TIMEOUT, STATUS_ERROR, RESULT_FORMAT, EXPORT_XLSX,
+)
+
+# 비동기 상태 확인 설정
+ASYNC_MAX_IN_FLIGHT = config.getint('Settings', 'async_max_in_flight', fallback=1000)
+ASYNC_PER_HOST_LIMIT = config.getint('Settings', 'async_per_host_limit', fallback=8)
+
+
+# 단일 URL 상태 확인 (HEAD 우선, 오류 응답이면 GET으로 재확인)
+async def fetch_status(session, url):
+    async with session.head(url, allow_redirects=True) as response:
+        status_code = response.status
+        history = response.history
+        final_url = str(response.url)
+
+    if status_code >= 400:
+        # 일부 서버는 HEAD 요청을 거부하므로 GET으로 다시 확인 (본문은 읽지 않음)
+        async with session.get(url, allow_redirects=True) as response:
+            status_code = response.status
+            history = response.history
+            final_url = str(response.url)
+
+    history_codes = [resp.status for resp in history]
+    history_urls = [str(resp.url) for resp in history]
+    return status_code, history_codes, history_urls, final_url
+
+
+# 한 행을 처리하여 process_link와 같은 redirect_codes, status, log 필드 생성
+async def check_row(session, row):
+    result = dict(row)
+    url = '' if pd.isna(row['url']) else str(row['url']).strip()
+    probe_start = time.perf_counter()
+    try:
+        status_code, history_codes, history_urls, final_url = await fetch_status(session, url)
+        classify_http_response(result, url, status_code, history_codes, history_urls, final_url)
+    # 한 URL의 예상하지 못한 예외도 오류 결과로 기록하여 gather 전체가 실패하지 않도록 함
+    except Exception as e:
+        logging.error(f"비동기 HTTP 요청 오류: {url} - {str(e)}")
+        result['status'] = STATUS_ERROR
+        result['log'] = f'오류 (HTTP 오류: {str(e)})'
+    result['probe_time'] = round(time.perf_counter() - probe_start, 3)
+    result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return result
+
+
+# 여러 행을 비동기로 처리
+# - 연결은 TCPConnector가 호스트별로 keep-alive 상태로 재사용
+# - limit_per_host로 호스트별 동시 연결 수 제한
+# - 작업자 코루틴 max_in_flight개가 큐에서 행을 가져가므로 동시 요청 수가 제한됨
+async def check_rows_async(rows, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+                           per_host_limit=ASYNC_PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT):
+    rows = list(rows)
+    results = [None] * len(rows)
+    work_queue = asyncio.Queue()
+    for index, row in enumerate(rows):
+        work_queue.put_nowait((index, row))
+
+    connector = aiohttp.TCPConnector(limit=max_in_flight, limit_per_host=per_host_limit, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def worker():
+            while True:
+                try:
+                    index, row = work_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[index] = await check_row(session, row)
+
+        worker_count = max(1, min(max_in_flight, len(rows)))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+
+    return results
+
+
+# 동기 코드에서 호출하기 위한 래퍼
+def check_rows(rows, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+               per_host_limit=ASYNC_PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT):
+    return asyncio.run(check_rows_async(rows, max_in_flight, per_host_limit, timeout))
+
+
+# 상태 코드만 빠르게 확인하는 메인 함수 (브라우저 렌더링 및 스크린샷 없음)
+@time_logger
+def check_links_async(input_file="test_data.xlsx"):
+    try:
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_base = f"processed_data_{current_time}"
+
+        df = pd.read_excel(input_file)
+        rows = df.to_dict('records')
+        hosts = {urlparse(str(row['url'])).netloc for row in rows}
+        logging.info(f"비동기 상태 확인 시작: URL {len(rows)}개, 호스트 {len(hosts)}개")
+
+        processed_df = pd.DataFrame(check_rows(rows))
+        output_file = write_results(processed_df, output_base, RESULT_FORMAT, EXPORT_XLSX)
+        logging.info(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+        print(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+
+    except Exception as e:
+        logging.error(f"파일 처리 중 오류 발생: {str(e)}")
+
+if __name__ == "__main__":
+    check_links_async(input_file="test_data_20241028.xlsx")
@@ -0,0 +1,119 @@
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from process_data import config, generate_hash, time_logger, RESULT_FORMAT, EXPORT_XLSX
+from result_files import read_results, find_result_files, write_results
+
+# 변경 보고서 파일 이름 접두사 (대시보드의 변경 사항 탭에서 최신 보고서를 찾을 때 사용)
+CHANGE_REPORT_PREFIX = 'change_report_'
+
+# 스크린샷 해시 간 해밍 거리가 이 값보다 크면 시각적 변경으로 판단
+VISUAL_CHANGE_DISTANCE = config.getint('Settings', 'visual_change_distance', fallback=10)
+
+# 변경 보고서에 포함할 열
+REPORT_COLUMNS = [
+    'id', 'url', 'change_type', 'previous_status', 'status', 'status_changed',
+    'content_changed', 'visual_distance', 'visual_changed', 'log', 'screenshot', 'last_checked',
+]
+
+
+# 처리 결과 파일 로드 (비교에 필요한 열만)
+def load_run(file_path):
+    df = read_results(file_path)
+    for column in ('content_fingerprint', 'dhash', 'log', 'screenshot', 'last_checked'):
+        if column not in df.columns:
+            df[column] = None
+    df['id'] = df['id'].astype(str)
+    df['url_hash'] = df['url'].astype(str).map(generate_hash)
+    df = df.drop_duplicates(['id', 'url_hash'], keep='last')
+    return df[['id', 'url', 'url_hash', 'status', 'content_fingerprint', 'dhash', 'log', 'screenshot', 'last_checked']]
+
+
+# 16진수 dHash 문자열을 uint64 배열로 변환 (없으면 0, 유효 여부 배열 함께 반환)
+def hashes_to_uint64(hashes):
+    valid = hashes.notna().to_numpy() & (hashes.astype(str).str.len() > 0).to_numpy()
+    values = np.zeros(len(hashes), dtype=np.uint64)
+    values[valid] = np.array([int(value, 16) for value in hashes[valid]], dtype=np.uint64)
+    return values, valid
+
+
+# 두 uint64 배열의 비트 단위 해밍 거리 (벡터화)
+def hamming_distances(values1, values2):
+    xor = np.bitwise_xor(values1, values2)
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+# 두 실행 결과를 id와 URL 해시로 매칭하여 변경 사항 계산
+def diff_runs(previous_df, current_df, visual_change_distance=VISUAL_CHANGE_DISTANCE):
+    merged = previous_df.merge(
+        current_df, on=['id', 'url_hash'], how='outer', suffixes=('_prev', ''), indicator=True
+    )
+    merged['url'] = merged['url'].fillna(merged['url_prev'])
+    merged['previous_status'] = merged['status_prev']
+
+    merged['change_type'] = np.select(
+        [merged['_merge'] == 'left_only', merged['_merge'] == 'right_only'],
+        ['removed', 'added'],
+        default='unchanged'
+    )
+    both = (merged['_merge'] == 'both').to_numpy()
+
+    # 상태 전이
+    merged['status_changed'] = both & (merged['status_prev'].fillna('') != merged['status'].fillna('')).to_numpy()
+
+    # 콘텐츠 지문 변경 (양쪽 모두 지문이 있는 경우만 비교)
+    fingerprint_known = merged['content_fingerprint_prev'].notna() & merged['content_fingerprint'].notna()
+    merged['content_changed'] = both & (
+        fingerprint_known & (merged['content_fingerprint_prev'] != merged['content_fingerprint'])
+    ).to_numpy()
+
+    # 스크린샷 해시 거리 (양쪽 모두 해시가 있는 경우만 비교)
+    previous_hashes, previous_valid = hashes_to_uint64(merged['dhash_prev'])
+    current_hashes, current_valid = hashes_to_uint64(merged['dhash'])
+    hash_known = previous_valid & current_valid
+    distances = hamming_distances(previous_hashes, current_hashes).astype(float)
+    distances[~hash_known] = np.nan
+    merged['visual_distance'] = distances
+    merged['visual_changed'] = both & hash_known & (np.nan_to_num(distances) > visual_change_distance)
+
+    changed = merged['status_changed'] | merged['content_changed'] | merged['visual_changed']
+    merged.loc[both & changed.to_numpy(), 'change_type'] = 'changed'
+    merged['status'] = merged['status'].fillna(merged['status_prev'])
+    merged['log'] = merged['log'].fillna(merged['log_prev'])
+    return merged[REPORT_COLUMNS]
+
+
+# 최근 처리 결과 파일 두 개 찾기 (이전, 최신 순)
+def find_latest_runs(directory='.'):
+    files = find_result_files(directory)
+    if len(files) < 2:
+        return None, None
+    return files[-2], files[-1]
+
+
+# 변경 보고서 생성 함수 - 변경, 추가, 삭제된 행만 처리 결과와 같은 형식으로 저장
+# (output_base는 확장자 제외 경로)
+@time_logger
+def write_change_report(previous_file=None, current_file=None, output_base=None):
+    if previous_file is None or current_file is None:
+        previous_file, current_file = find_latest_runs()
+        if previous_file is None:
+            logging.warning("비교할 처리 결과 파일이 두 개 이상 필요합니다.")
+            return None
+    if output_base is None:
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_base = f"{CHANGE_REPORT_PREFIX}{current_time}"
+
+    report = diff_runs(load_run(previous_file), load_run(current_file))
+    report = report[report['change_type'] != 'unchanged']
+    output_file = write_results(report, output_base, RESULT_FORMAT, EXPORT_XLSX)
+
+    summary = report['change_type'].value_counts().to_dict()
+    logging.info(f"변경 보고서 저장: {output_file} ({previous_file} -> {current_file}, {summary})")
+    print(f"변경 보고서가 {output_file} 파일로 저장되었습니다. {summary}")
+    return output_file
+
+if __name__ == "__main__":
+    write_change_report()
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+# 도메인별 요청 제한 스케줄러
+# - 도메인별 동시 처리 수 제한 (세마포어)
+# - 도메인별 초당 요청 수 제한 (요청 간 최소 간격)
+# - Retry-After 응답을 받으면 해당 도메인 요청을 지정된 시간까지 보류
+class DomainScheduler:
+    def __init__(self, max_concurrency=2, requests_per_second=2.0):
+        self.max_concurrency = max_concurrency
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_allowed = {}
+        self.wait_count = 0
+        self.wait_total = 0.0
+
+    def _semaphore(self, domain):
+        with self._lock:
+            if domain not in self._semaphores:
+                self._semaphores[domain] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._semaphores[domain]
+
+    # 도메인의 다음 요청 가능 시각까지 대기
+    def throttle(self, domain):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(domain, 0.0))
+            self._next_allowed[domain] = start + self.min_interval
+            wait = start - now
+            if wait > 0:
+                self.wait_count += 1
+                self.wait_total += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    # Retry-After 등으로 도메인 요청을 seconds초 동안 보류
+    def defer(self, domain, seconds):
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._next_allowed[domain] = max(self._next_allowed.get(domain, 0.0), until)
+        logging.warning(f"{domain} 요청을 {seconds:.1f}초 동안 보류합니다.")
+
+    # 도메인 처리 슬롯 확보 (동시 처리 수 및 요청 간격 제한)
+    @contextmanager
+    def slot(self, domain):
+        semaphore = self._semaphore(domain)
+        semaphore.acquire()
+        try:
+            self.throttle(domain)
+            yield
+        finally:
+            semaphore.release()
+
+    def log_stats(self):
+        message = (
+            f"도메인 스케줄러 통계 - 도메인 {len(self._semaphores)}개, "
+            f"대기 {self.wait_count}회 (총 {self.wait_total:.2f}초)"
+        )
+        logging.info(message)
+        print(message)
+
+
+# Retry-After 헤더 값을 초 단위로 변환 (초 또는 HTTP 날짜 형식)
+def parse_retry_after(value):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# 도메인별로 항목을 번갈아 배치하여 한 도메인에 요청이 몰리지 않도록 정렬
+def interleave_by_domain(items, domain_key):
+    queues = OrderedDict()
+    for item in items:
+        queues.setdefault(domain_key(item), deque()).append(item)
+
+    interleaved = []
+    while queues:
+        for domain in list(queues):
+            interleaved.append(queues[domain].popleft())
+            if not queues[domain]:
+                del queues[domain]
+    return interleaved
@@ -0,0 +1,174 @@
+import logging
+import queue
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+# 재사용 가능한 Headless Chrome 드라이버 풀
+# - 최대 size개의 드라이버만 동시에 존재 (bounded)
+# - max_uses회 사용 후 또는 크래시 발생 시 드라이버 교체
+# - 반납 시 쿠키와 스토리지를 초기화하여 URL 간 상태가 섞이지 않도록 함
+# - setup이 주어지면 새 드라이버마다 호출 (창 크기, 차단 URL 등 세션 설정)
+class DriverPool:
+    def __init__(self, options, size, max_uses=50, window_size=(1920, 1080), setup=None):
+        self.options = options
+        self.size = size
+        self.max_uses = max_uses
+        self.window_size = window_size
+        self.setup = setup
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 통계 정보
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.startup_times = []
+
+    # 새 드라이버 생성 (시작 시간 기록)
+    def _create_driver(self):
+        start_time = time.perf_counter()
+        driver = webdriver.Chrome(options=self.options)
+        driver.set_window_size(*self.window_size)
+        if self.setup is not None:
+            self.setup(driver)
+        elapsed = time.perf_counter() - start_time
+        with self._lock:
+            self.startup_times.append(elapsed)
+            self._uses[id(driver)] = 0
+        logging.info(f"드라이버 생성 완료 ({elapsed:.2f}초)")
+        return driver
+
+    # 드라이버 종료
+    def _quit_driver(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"드라이버 종료 실패: {str(e)}")
+
+    # 쿠키 및 스토리지 초기화 후 빈 페이지로 이동
+    def _reset_driver(self, driver):
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); } catch (e) {}"
+                "try { window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except WebDriverException:
+            pass
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    # 드라이버 대여 (유휴 드라이버가 있으면 hit, 없으면 새로 생성하여 miss)
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("이미 종료된 드라이버 풀입니다.")
+        self._slots.acquire()
+        try:
+            driver = self._idle.get_nowait()
+            with self._lock:
+                self.hits += 1
+        except queue.Empty:
+            with self._lock:
+                self.misses += 1
+            try:
+                driver = self._create_driver()
+            except Exception:
+                self._slots.release()
+                raise
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    # 드라이버 반납 (크래시 또는 사용 횟수 초과 시 교체)
+    def release(self, driver, broken=False):
+        try:
+            with self._lock:
+                uses = self._uses.get(id(driver), 0)
+
+            if broken:
+                with self._lock:
+                    self.crashed += 1
+                logging.warning("크래시가 발생한 드라이버를 교체합니다.")
+                self._quit_driver(driver)
+                return
+
+            if self._closed or uses >= self.max_uses:
+                if not self._closed:
+                    with self._lock:
+                        self.recycled += 1
+                self._quit_driver(driver)
+                return
+
+            try:
+                self._reset_driver(driver)
+            except Exception as e:
+                logging.warning(f"드라이버 초기화 실패, 교체합니다: {str(e)}")
+                with self._lock:
+                    self.crashed += 1
+                self._quit_driver(driver)
+                return
+
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    # 전체 드라이버 종료
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit_driver(driver)
+
+    # 풀 통계 반환
+    def stats(self):
+        with self._lock:
+            startup_times = list(self.startup_times)
+            stats = {
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'recycled': self.recycled,
+                'crashed': self.crashed,
+            }
+        total_requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / total_requests if total_requests else 0.0
+        stats['startups'] = len(startup_times)
+        stats['startup_total'] = sum(startup_times)
+        stats['startup_avg'] = stats['startup_total'] / len(startup_times) if startup_times else 0.0
+        stats['startup_max'] = max(startup_times) if startup_times else 0.0
+        return stats
+
+    # 풀 통계 로그 출력
+    def log_stats(self):
+        stats = self.stats()
+        message = (
+            f"드라이버 풀 통계 - hit: {stats['hits']}, miss: {stats['misses']} "
+            f"(hit rate {stats['hit_rate']:.1%}), 교체: {stats['recycled']}, 크래시: {stats['crashed']}, "
+            f"드라이버 시작 {stats['startups']}회 (총 {stats['startup_total']:.2f}초, "
+            f"평균 {stats['startup_avg']:.2f}초, 최대 {stats['startup_max']:.2f}초)"
+        )
+        logging.info(message)
+        print(message)
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,4 +1,7 @@
+import argparse
+import os
 import random
+import numpy as np
 import pandas as pd
 
 # 테스트 데이터 생성 함수
@@ -34,6 +37,132 @@ def generate_test_data(num_samples=10, output_file="test_data.xlsx"):
     df.to_excel(output_file, index=False)
     print(f"데이터가 {output_file} 파일로 저장되었습니다.")
 
-# 실행 시 데이터 생성
+# ------------------------ 대규모 부하 테스트 데이터 ------------------------
+
+WORKLOAD_TITLES = np.array([
+    '최신 스마트폰 출시', '여름 맞이 패션 아이템', '건강한 식단 가이드',
+    '프로그래밍 입문서', '여행지 추천', '홈트레이닝 방법',
+    '신작 영화 리뷰', '재테크 비법', '사진 촬영 팁', 'DIY 인테리어'
+])
+
+# 기대 상태별 비율과 URL 경로 (test_suite/bench_server.py의 페이지 유형과 동일)
+DEFAULT_STATUS_MIX = {
+    'OK': 0.7,
+    'REDIRECT': 0.1,
+    'CLIENT_ERROR': 0.08,
+    'SERVER_ERROR': 0.02,
+    'EMPTY_CONTENT': 0.05,
+    'YOUTUBE_UNAVAILABLE': 0.05,
+}
+STATUS_PATHS = {
+    'OK': 'static',
+    'REDIRECT': 'redirect',
+    'CLIENT_ERROR': 'missing',
+    'SERVER_ERROR': 'error',
+    'EMPTY_CONTENT': 'empty',
+    'YOUTUBE_UNAVAILABLE': 'youtube',
+}
+
+# splitmix64 해시로 URL 번호마다 고정된 난수 생성 (같은 URL 번호는 항상 같은 도메인과 상태)
+def _hash_uniform(values, salt):
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+# 대규모 부하 테스트 데이터 생성 함수 (NumPy 벡터화, 청크 단위 스트리밍 저장)
+# - duplication_ratio: 이전에 나온 URL을 다시 참조하는 행의 비율
+# - zipf_a: 도메인 분포의 Zipf 지수 (클수록 상위 도메인에 집중)
+# - status_mix: 기대 상태별 비율
+# - seed: 같은 값이면 같은 데이터 생성
+# - base_url: 지정하면 모든 URL을 이 주소 아래로 생성 (예: 로컬 벤치마크 서버, 기본값은 접속할 수 없는 가상 도메인)
+def generate_workload(num_rows=1_000_000, output_file="workload.parquet", chunk_size=100_000,
+                      duplication_ratio=0.5, num_domains=1000, zipf_a=1.2, status_mix=None, seed=0, base_url=None):
+    status_mix = status_mix or DEFAULT_STATUS_MIX
+    rng = np.random.default_rng(seed)
+
+    # 도메인 순위별 Zipf 확률의 누적 분포
+    domain_weights = 1.0 / np.arange(1, num_domains + 1) ** zipf_a
+    domain_cdf = np.cumsum(domain_weights / domain_weights.sum())
+    if base_url:
+        domains = np.full(num_domains, base_url.rstrip('/'), dtype=object)
+    else:
+        domains = np.array([f"https://www.site{rank:05d}.example" for rank in range(num_domains)], dtype=object)
+
+    statuses = np.array(list(status_mix.keys()), dtype=object)
+    status_weights = np.array(list(status_mix.values()), dtype=np.float64)
+    status_cdf = np.cumsum(status_weights / status_weights.sum())
+    status_paths = np.array([STATUS_PATHS.get(status, 'static') for status in statuses], dtype=object)
+
+    extension = os.path.splitext(output_file)[1].lower()
+    if extension not in ('.csv', '.parquet'):
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_file}")
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+    parquet_writer = None
+    next_unique = 0
+    try:
+        for start in range(0, num_rows, chunk_size):
+            size = min(chunk_size, num_rows - start)
+
+            # 중복 행은 이전에 생성된 URL 번호 중 하나를 재사용
+            duplicate = rng.random(size) < duplication_ratio
+            if next_unique == 0:
+                duplicate[0] = False
+            new = ~duplicate
+            new_before = np.cumsum(new) - new
+            url_ids = np.empty(size, dtype=np.int64)
+            url_ids[new] = next_unique + np.arange(new.sum())
+            available = next_unique + new_before[duplicate]
+            url_ids[duplicate] = (rng.random(duplicate.sum()) * available).astype(np.int64)
+            next_unique += int(new.sum())
+
+            # URL 번호로부터 도메인과 기대 상태 결정
+            domain_index = np.minimum(np.searchsorted(domain_cdf, _hash_uniform(url_ids, seed * 2 + 1)), num_domains - 1)
+            status_index = np.minimum(np.searchsorted(status_cdf, _hash_uniform(url_ids, seed * 2 + 2)), len(statuses) - 1)
+            url_numbers = pd.Series(url_ids).astype(str)
+
+            chunk = pd.DataFrame({
+                'id': 'W' + pd.Series(np.arange(start, start + size)).astype(str).str.zfill(9),
+                'title': WORKLOAD_TITLES[rng.integers(0, len(WORKLOAD_TITLES), size)],
+                'url': pd.Series(domains[domain_index]) + '/' + pd.Series(status_paths[status_index]) + '/' + url_numbers,
+                'page_type': np.where(rng.random(size) < 0.5, '제품', '정보'),
+                'expected_status': statuses[status_index],
+                'last_checked': None,
+                'status': None,
+            })
+
+            if extension == '.csv':
+                chunk.to_csv(output_file, mode='a', header=(start == 0), index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_file, table.schema)
+                parquet_writer.write_table(table)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    print(f"데이터가 {output_file} 파일로 저장되었습니다. (행 {num_rows}개, 고유 URL {next_unique}개)")
+
+# 실행 시 데이터 생성 (--workload를 지정하면 대규모 부하 테스트 데이터 생성)
 if __name__ == "__main__":
-    generate_test_data(num_samples=20, output_file="test_data.xlsx")
+    parser = argparse.ArgumentParser(description="링크 검사 테스트 데이터 생성")
+    parser.add_argument('--workload', type=int, default=None, help="부하 테스트 데이터 행 수")
+    parser.add_argument('--output', default=None, help="출력 파일 (부하 테스트 데이터는 .parquet 또는 .csv)")
+    parser.add_argument('--base-url', default=None, help="부하 테스트 URL의 기본 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument('--duplication-ratio', type=float, default=0.5)
+    parser.add_argument('--num-domains', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.workload:
+        generate_workload(args.workload, args.output or "workload.parquet", duplication_ratio=args.duplication_ratio,
+                          num_domains=args.num_domains, seed=args.seed, base_url=args.base_url)
+    else:
+        generate_test_data(num_samples=20, output_file=args.output or "test_data.xlsx")
@@ -0,0 +1,155 @@
+import argparse
+import json
+import logging
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from result_files import find_result_files, read_results
+
+# 정상으로 집계하는 상태 (가동률 계산용)
+UP_STATUSES = ('OK', 'REDIRECT')
+
+# 처리 결과 파일 이름의 실행 시각 (processed_data_YYYYMMDD_HHMMSS)
+RUN_TIME_PATTERN = re.compile(r'processed_data_(\d{8}_\d{6})')
+
+HISTORY_COLUMNS = ['id', 'url', 'status', 'last_checked']
+
+
+# 실행 시각 (파일 이름에 없으면 수정 시각)
+def run_time_of(path):
+    match = RUN_TIME_PATTERN.search(os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+# URL 열에서 주 도메인 추출 (process_data.extract_main_domain과 같은 규칙, 벡터 연산)
+def main_domains(urls):
+    netloc = urls.astype(str).str.extract(r'^[A-Za-z][\w+.-]*://([^/?#]*)', expand=False).fillna('')
+    return netloc.str.split('.').str[-2:].str.join('.')
+
+
+# 처리 결과 이력 저장소
+# - runs/date=YYYY-MM-DD/<실행 ID>.parquet: 실행별 URL 상태 (날짜로 분할, URL별 상태 변화 조회용)
+# - daily.parquet: 날짜, 도메인, 상태별 개수 (추이 및 가동률 차트용 사전 집계)
+# - ingested.json: 이미 반영한 결과 파일 목록 (새 실행만 추가)
+class HistoryStore:
+    def __init__(self, history_dir='history'):
+        self.history_dir = history_dir
+        self.runs_dir = os.path.join(history_dir, 'runs')
+        self.daily_path = os.path.join(history_dir, 'daily.parquet')
+        self.manifest_path = os.path.join(history_dir, 'ingested.json')
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def _partition_dir(self, date):
+        return os.path.join(self.runs_dir, f"date={date}")
+
+    # 처리 결과 파일 하나를 실행별 이력 파티션으로 저장하고 날짜 반환
+    def _ingest_run(self, path):
+        run_time = run_time_of(path)
+        df = read_results(path)
+        # 파티션 간 스키마가 같도록 열과 형식을 고정
+        df = df.reindex(columns=HISTORY_COLUMNS)
+        for column in HISTORY_COLUMNS:
+            df[column] = df[column].fillna('').astype(str)
+        df['domain'] = main_domains(df['url'])
+        df['up'] = df['status'].isin(UP_STATUSES)
+        df['run_id'] = run_time.strftime('%Y%m%d_%H%M%S')
+        df['run_time'] = pd.Timestamp(run_time)
+
+        date = run_time.strftime('%Y-%m-%d')
+        os.makedirs(self._partition_dir(date), exist_ok=True)
+        df.to_parquet(os.path.join(self._partition_dir(date), f"{df['run_id'].iat[0]}.parquet"), index=False)
+        return date
+
+    # 한 날짜 파티션의 도메인, 상태별 개수 (같은 URL을 하루에 여러 번 검사하면 각각 집계)
+    def _aggregate_date(self, date):
+        runs = pd.read_parquet(self._partition_dir(date), columns=['domain', 'status', 'up'])
+        daily = runs.groupby(['domain', 'status'], as_index=False).agg(count=('up', 'size'), up=('up', 'sum'))
+        daily.insert(0, 'date', pd.Timestamp(date))
+        return daily
+
+    # 새 처리 결과 파일을 이력에 추가하고, 바뀐 날짜의 일별 집계만 다시 계산
+    def ingest(self, directory='.'):
+        os.makedirs(self.runs_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        new_files = [
+            path for path in find_result_files(directory)
+            if manifest.get(os.path.basename(path)) != os.path.getmtime(path)
+        ]
+        if not new_files:
+            logging.info("이력에 추가할 새 처리 결과가 없습니다.")
+            return 0
+
+        changed_dates = set()
+        for path in new_files:
+            try:
+                changed_dates.add(self._ingest_run(path))
+                manifest[os.path.basename(path)] = os.path.getmtime(path)
+            except Exception as e:
+                logging.error(f"이력 추가 실패: {path} - {str(e)}")
+
+        daily = self.load_daily()
+        if not daily.empty:
+            daily = daily[~daily['date'].isin(pd.to_datetime(sorted(changed_dates)))]
+        # 빈 프레임은 빼고 합쳐서 열 형식을 유지 (합칠 프레임이 없으면 빈 집계 그대로 저장)
+        frames = [frame for frame in [daily] + [self._aggregate_date(date) for date in sorted(changed_dates)]
+                  if not frame.empty]
+        if frames:
+            daily = pd.concat(frames, ignore_index=True)
+        daily.sort_values(['date', 'domain', 'status']).to_parquet(self.daily_path, index=False)
+        self._save_manifest(manifest)
+
+        message = f"이력 저장소 갱신: 처리 결과 {len(new_files)}개, 날짜 {len(changed_dates)}개"
+        logging.info(message)
+        print(message)
+        return len(new_files)
+
+    def load_daily(self):
+        if not os.path.exists(self.daily_path):
+            return pd.DataFrame(columns=['date', 'domain', 'status', 'count', 'up'])
+        return pd.read_parquet(self.daily_path)
+
+    # 날짜별 상태 개수 (전체 도메인 합계)
+    def status_trend(self):
+        daily = self.load_daily()
+        return daily.groupby(['date', 'status'], as_index=False)['count'].sum()
+
+    # 날짜별 도메인 가동률 (정상 상태 비율)
+    def uptime_trend(self, domains=None):
+        daily = self.load_daily()
+        if domains:
+            daily = daily[daily['domain'].isin(domains)]
+        uptime = daily.groupby(['date', 'domain'], as_index=False)[['up', 'count']].sum()
+        uptime['uptime'] = uptime['up'] / uptime['count']
+        return uptime
+
+    # 한 URL의 실행별 상태 변화 (날짜 파티션에서 해당 URL 행만 읽음)
+    def url_history(self, url):
+        if not os.path.exists(self.runs_dir):
+            return pd.DataFrame(columns=['run_time', 'status'])
+        history = pd.read_parquet(self.runs_dir, filters=[('url', '==', str(url))],
+                                  columns=['run_time', 'id', 'status', 'last_checked'])
+        return history.sort_values('run_time')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="처리 결과 파일을 이력 저장소로 압축")
+    parser.add_argument('--directory', default='.', help="processed_data_* 파일이 있는 디렉토리")
+    parser.add_argument('--history-dir', default='history')
+    args = parser.parse_args()
+    HistoryStore(args.history_dir).ingest(args.directory)
@@ -0,0 +1,138 @@
+import logging
+import os
+
+import pandas as pd
+from PIL import Image
+
+# dHash 크기 (8x8 = 64비트)
+HASH_SIZE = 8
+# 64비트 해시를 나누는 밴드 수 (거리 BANDS-1 이하인 해시는 최소 한 밴드가 일치)
+HASH_BANDS = 4
+
+
+# 차이 해시(dHash) 계산 - 가로로 인접한 픽셀 밝기 비교 결과를 16진수 문자열로 반환
+def compute_dhash(image, hash_size=HASH_SIZE):
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+
+# 두 해시 간 해밍 거리
+def hamming_distance(hash1, hash2):
+    return bin(int(hash1, 16) ^ int(hash2, 16)).count('1')
+
+
+# 유사 해시 묶기 (밴드별 인덱스로 후보를 찾고 Union-Find로 병합)
+# - transitive: 유사한 해시를 연쇄적으로 병합 (A~B, B~C이면 A와 C가 멀어도 같은 클러스터)
+# - transitive=False: 클러스터 대표 해시와의 거리가 max_distance 이하인 해시만 같은 클러스터
+# 반환값: 해시별 클러스터 번호 리스트 (해시가 없으면 -1)
+def cluster_hashes(hashes, max_distance=3, transitive=True):
+    if max_distance >= HASH_BANDS:
+        logging.warning(f"max_distance {max_distance}는 밴드 인덱스 범위를 넘어 일부 유사 이미지를 놓칠 수 있습니다.")
+    if not transitive:
+        return _cluster_by_representative(hashes, max_distance)
+
+    parent = list(range(len(hashes)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    band_width = HASH_SIZE * HASH_SIZE // 4 // HASH_BANDS
+    band_index = {}
+    for index, image_hash in enumerate(hashes):
+        if not isinstance(image_hash, str) or not image_hash:
+            continue
+        for band in range(HASH_BANDS):
+            key = (band, image_hash[band * band_width:(band + 1) * band_width])
+            for candidate in band_index.get(key, ()):
+                root_a, root_b = find(index), find(candidate)
+                if root_a != root_b and hamming_distance(image_hash, hashes[candidate]) <= max_distance:
+                    parent[root_a] = root_b
+            band_index.setdefault(key, []).append(index)
+
+    cluster_ids = {}
+    clusters = []
+    for index, image_hash in enumerate(hashes):
+        if not isinstance(image_hash, str) or not image_hash:
+            clusters.append(-1)
+            continue
+        clusters.append(cluster_ids.setdefault(find(index), len(cluster_ids)))
+    return clusters
+
+
+# 대표 해시 기준 클러스터링 (먼저 나온 해시가 대표, 대표들만 밴드 인덱스에 등록)
+def _cluster_by_representative(hashes, max_distance):
+    band_width = HASH_SIZE * HASH_SIZE // 4 // HASH_BANDS
+    band_index = {}
+    clusters = []
+    cluster_count = 0
+    for image_hash in hashes:
+        if not isinstance(image_hash, str) or not image_hash:
+            clusters.append(-1)
+            continue
+        keys = [(band, image_hash[band * band_width:(band + 1) * band_width]) for band in range(HASH_BANDS)]
+        cluster = next((
+            candidate_cluster
+            for key in keys
+            for candidate_hash, candidate_cluster in band_index.get(key, ())
+            if hamming_distance(image_hash, candidate_hash) <= max_distance
+        ), None)
+        if cluster is None:
+            cluster = cluster_count
+            cluster_count += 1
+            for key in keys:
+                band_index.setdefault(key, []).append((image_hash, cluster))
+        clusters.append(cluster)
+    return clusters
+
+
+# 결과 테이블에 클러스터 번호 부여 (갤러리는 클러스터별 대표 이미지 하나만 표시)
+# - image_cluster: 유사 스크린샷 묶음 번호
+# - 기본값은 파일과 경로를 그대로 두고 클러스터 번호만 기록
+# - remove_files이면 remove_max_distance 이하로 대표와 거의 같은 스크린샷만 대표 파일로 교체하고 삭제
+#   (삭제는 되돌릴 수 없으므로 연쇄 병합 없이 대표 해시와 직접 비교)
+def dedupe_screenshots(df, max_distance=3, remove_files=False, remove_max_distance=0):
+    if 'dhash' not in df.columns:
+        return df
+
+    df = df.copy()
+    df['image_cluster'] = cluster_hashes(df['dhash'].tolist(), max_distance)
+    if not remove_files:
+        clustered = df['image_cluster'][df['image_cluster'] >= 0]
+        logging.info(f"유사 스크린샷 분류: 스크린샷 {len(clustered)}개 -> 클러스터 {clustered.nunique()}개")
+        return df
+
+    # 삭제 대상은 별도의 엄격한 기준으로 묶음
+    duplicate_cluster = pd.Series(
+        cluster_hashes(df['dhash'].tolist(), remove_max_distance, transitive=False), index=df.index)
+    clustered = df[duplicate_cluster >= 0]
+    duplicate_cluster = duplicate_cluster[clustered.index]
+    representatives = clustered.groupby(duplicate_cluster)['screenshot'].first()
+    replaced = duplicate_cluster.map(representatives)
+    duplicate_files = set(clustered['screenshot'].dropna()) - set(representatives.dropna())
+
+    df.loc[clustered.index, 'screenshot'] = replaced
+    if 'thumbnail' in df.columns:
+        thumbnails = clustered.groupby(duplicate_cluster)['thumbnail'].first()
+        duplicate_files |= set(clustered['thumbnail'].dropna()) - set(thumbnails.dropna())
+        df.loc[clustered.index, 'thumbnail'] = duplicate_cluster.map(thumbnails)
+
+    for path in duplicate_files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    logging.info(
+        f"중복 스크린샷 정리: 스크린샷 {len(clustered)}개 -> 대표 {len(representatives)}개, "
+        f"중복 파일 {len(duplicate_files)}개 제거"
+    )
+    return df
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import codecs
+import logging
+import time
+from datetime import datetime
+
+import aiohttp
+import pandas as pd
+
+from process_data import (
+    config, canonicalize_url, classify_http_response, extract_main_domain, time_logger,
+    LinkExtractor, REQUEST_TIMEOUT, STATUS_ERROR, STATUS_OK, STATUS_REDIRECT,
+)
+from async_checker import fetch_status, ASYNC_MAX_IN_FLIGHT, ASYNC_PER_HOST_LIMIT
+
+# 링크 그래프 크롤링 설정
+CRAWL_MAX_DEPTH = config.getint('Crawl', 'max_depth', fallback=1)
+CRAWL_MAX_PAGES = config.getint('Crawl', 'max_pages', fallback=50000)
+CRAWL_MAX_LINKS_PER_PAGE = config.getint('Crawl', 'max_links_per_page', fallback=500)
+CRAWL_MAX_BODY_BYTES = config.getint('Crawl', 'max_body_bytes', fallback=2 * 1024 * 1024)
+CRAWL_SAME_DOMAIN_ONLY = config.getboolean('Crawl', 'same_domain_only', fallback=True)
+
+# 본문을 읽어 링크를 추출할 응답 형식
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+BODY_CHUNK_SIZE = 64 * 1024
+
+
+# GET 응답 본문을 조각 단위로 토크나이저에 넣으며 링크 추출 (최대 max_body_bytes까지만 읽음)
+async def fetch_links(session, url, max_body_bytes=CRAWL_MAX_BODY_BYTES):
+    async with session.get(url, allow_redirects=True) as response:
+        status_code = response.status
+        history_codes = [resp.status for resp in response.history]
+        history_urls = [str(resp.url) for resp in response.history]
+        final_url = str(response.url)
+
+        links = []
+        if status_code < 400 and response.content_type in HTML_CONTENT_TYPES:
+            extractor = LinkExtractor(final_url)
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+            body_bytes = 0
+            async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                extractor.feed(decoder.decode(chunk))
+                body_bytes += len(chunk)
+                if body_bytes >= max_body_bytes:
+                    logging.warning(f"본문이 {max_body_bytes}바이트를 넘어 링크 추출 중단: {url}")
+                    break
+            extractor.feed(decoder.decode(b'', final=True))
+            extractor.close()
+            links = extractor.links
+
+    return status_code, history_codes, history_urls, final_url, links
+
+
+# 시드 행에서 시작하여 링크 그래프를 너비 우선으로 크롤링
+# - 방문 집합은 정규화된 URL(canonicalize_url) 기준이므로 같은 페이지는 한 번만 요청
+# - max_depth 미만의 페이지는 GET으로 본문을 읽어 링크를 추출, max_depth 페이지는 상태만 확인
+# - same_domain_only이면 시드와 다른 도메인의 페이지는 상태만 확인하고 더 따라가지 않음
+# - 브라우저 없이 aiohttp로만 요청 (연결 수 제한은 async_checker와 동일)
+class LinkCrawler:
+    def __init__(self, max_depth=CRAWL_MAX_DEPTH, max_pages=CRAWL_MAX_PAGES,
+                 max_links_per_page=CRAWL_MAX_LINKS_PER_PAGE, same_domain_only=CRAWL_SAME_DOMAIN_ONLY,
+                 max_in_flight=ASYNC_MAX_IN_FLIGHT, per_host_limit=ASYNC_PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_links_per_page = max_links_per_page
+        self.same_domain_only = same_domain_only
+        self.max_in_flight = max_in_flight
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        self.pages = {}  # 정규화된 URL -> 페이지 결과
+        self.edges = []  # (출발 URL, 도착 URL)
+        self.skipped = 0  # max_pages 초과로 방문하지 않은 링크 수
+
+    # 방문하지 않은 URL이면 페이지를 등록하고 큐에 추가
+    def _enqueue(self, work_queue, url, depth, parent, seed_domain, row=None):
+        key = canonicalize_url(url)
+        if key in self.pages:
+            return key
+        if len(self.pages) >= self.max_pages:
+            self.skipped += 1
+            return None
+        page = dict(row) if row is not None else {'id': f"C{len(self.pages):07d}"}
+        page.update({'url': url, 'depth': depth, 'parent': parent, 'seed_domain': seed_domain})
+        self.pages[key] = page
+        work_queue.put_nowait(key)
+        return key
+
+    async def _check_page(self, session, work_queue, key):
+        page = self.pages[key]
+        url = page['url']
+        expand = page['depth'] < self.max_depth and (
+            not self.same_domain_only or extract_main_domain(url) == page['seed_domain']
+        )
+        probe_start = time.perf_counter()
+        links = []
+        try:
+            if expand:
+                status_code, history_codes, history_urls, final_url, links = await fetch_links(session, url)
+            else:
+                status_code, history_codes, history_urls, final_url = await fetch_status(session, url)
+            classify_http_response(page, url, status_code, history_codes, history_urls, final_url)
+        # 한 페이지의 예상하지 못한 예외도 오류 결과로 기록 (상태가 비어 있는 페이지가 남지 않도록)
+        except Exception as e:
+            logging.error(f"크롤링 요청 오류: {url} - {str(e)}")
+            page['status'] = STATUS_ERROR
+            page['log'] = f'오류 (HTTP 오류: {str(e)})'
+        page['probe_time'] = round(time.perf_counter() - probe_start, 3)
+        page['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        if page['status'] not in (STATUS_OK, STATUS_REDIRECT):
+            links = []
+        if len(links) > self.max_links_per_page:
+            logging.warning(f"링크 {len(links)}개 중 {self.max_links_per_page}개만 따라감: {url}")
+            links = links[:self.max_links_per_page]
+        page['outbound_links'] = len(links)
+
+        for link in links:
+            if not link.startswith(('http://', 'https://')):
+                continue
+            child_key = self._enqueue(work_queue, link, page['depth'] + 1, url, page['seed_domain'])
+            if child_key is not None:
+                self.edges.append((url, self.pages[child_key]['url']))
+
+    async def crawl(self, seed_rows):
+        work_queue = asyncio.Queue()
+        for row in seed_rows:
+            url = str(row['url']).strip()
+            self._enqueue(work_queue, url, 0, None, extract_main_domain(url), row)
+
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.per_host_limit, ttl_dns_cache=300)
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            # 처리 중에 새 링크가 큐에 추가되므로 큐가 완전히 비워질 때까지 작업자 유지
+            async def worker():
+                while True:
+                    key = await work_queue.get()
+                    try:
+                        await self._check_page(session, work_queue, key)
+                    except Exception as e:
+                        logging.error(f"크롤링 처리 실패: {key} - {str(e)}")
+                    finally:
+                        work_queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(max(1, self.max_in_flight))]
+            await work_queue.join()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        message = f"크롤링 완료: 페이지 {len(self.pages)}개, 링크 {len(self.edges)}개, 한도 초과로 건너뛴 링크 {self.skipped}개"
+        logging.info(message)
+        print(message)
+        return self.pages_frame(), self.edges_frame()
+
+    def pages_frame(self):
+        return pd.DataFrame(list(self.pages.values()))
+
+    def edges_frame(self):
+        return pd.DataFrame(self.edges, columns=['source_url', 'target_url'])
+
+
+# 시트의 URL을 시드로 링크 그래프를 크롤링하여 페이지 상태(pages)와 링크(links) 시트로 저장
+@time_logger
+def crawl_links(input_file="test_data.xlsx", max_depth=CRAWL_MAX_DEPTH, output_file=None):
+    try:
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = output_file or f"crawl_graph_{current_time}.xlsx"
+
+        df = pd.read_excel(input_file)
+        crawler = LinkCrawler(max_depth=max_depth)
+        pages_df, edges_df = asyncio.run(crawler.crawl(df.to_dict('records')))
+
+        with pd.ExcelWriter(output_file) as writer:
+            pages_df.to_excel(writer, sheet_name='pages', index=False)
+            edges_df.to_excel(writer, sheet_name='links', index=False)
+        logging.info(f"크롤링 결과가 {output_file} 파일로 저장되었습니다.")
+        print(f"크롤링 결과가 {output_file} 파일로 저장되었습니다.")
+
+    except Exception as e:
+        logging.error(f"크롤링 중 오류 발생: {str(e)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시드 URL에서 시작하는 링크 그래프 크롤링")
+    parser.add_argument('input_file', help="시드 URL이 들어 있는 엑셀 파일")
+    parser.add_argument('--depth', type=int, default=CRAWL_MAX_DEPTH, help="시드에서 따라갈 최대 링크 깊이")
+    parser.add_argument('--output', default=None, help="결과 엑셀 파일")
+    args = parser.parse_args()
+    crawl_links(args.input_file, max_depth=args.depth, output_file=args.output)
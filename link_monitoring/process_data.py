@@ -5,17 +5,32 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException, TimeoutException
 from datetime import datetime
 import os
 import shutil
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import hashlib
+import functools
+import threading
 from PIL import Image, ImageDraw, ImageFont
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlparse, urlunparse, urljoin
+from html.parser import HTMLParser
 import re
 import configparser
+from driver_pool import DriverPool
+from result_store import ResultStore
+from screenshot_encoder import ScreenshotEncoder
+from image_index import dedupe_screenshots
+from stage_metrics import StageSpans, StageMetrics, SPAN_FIELDS
+from domain_scheduler import DomainScheduler, interleave_by_domain, parse_retry_after
+from retry_policy import DomainPolicy, backoff_delay, CIRCUIT_OPEN
+from render_profile import RenderProfile
+from result_files import write_results, LiveResultWriter
+from history_store import HistoryStore
+from thumbnail_cache import ThumbnailCache
 
 # ------------------------ 설정 파일 읽기 ------------------------
 config = configparser.ConfigParser()
@@ -34,6 +49,43 @@ MAX_THREADS = config.getint('Settings', 'max_threads', fallback=16)
 REQUEST_TIMEOUT = config.getint('Settings', 'request_timeout', fallback=20)
 WAIT_FOR_PAGE_TIMEOUT = config.getint('Settings', 'wait_for_page_timeout', fallback=20)
 DEFAULT_FONT_PATH = config.get('Settings', 'default_font_path', fallback='/usr/share/fonts/truetype/nanum/NanumGothic.ttf')
+DRIVER_MAX_USES = config.getint('Settings', 'driver_max_uses', fallback=50)
+PAGE_STABILITY_MODE = config.get('Settings', 'page_stability_mode', fallback='observer')
+PAGE_QUIET_WINDOW = config.getfloat('Settings', 'page_quiet_window', fallback=0.5)
+DOMAIN_MAX_CONCURRENCY = config.getint('Settings', 'domain_max_concurrency', fallback=2)
+DOMAIN_REQUESTS_PER_SECOND = config.getfloat('Settings', 'domain_requests_per_second', fallback=2.0)
+RETRY_AFTER_MAX = config.getint('Settings', 'retry_after_max', fallback=60)
+SCREENSHOT_FORMAT = config.get('Settings', 'screenshot_format', fallback='jpg')
+SCREENSHOT_ENCODER_WORKERS = config.getint('Settings', 'screenshot_encoder_workers', fallback=4)
+SCREENSHOT_MAX_WIDTH = config.getint('Settings', 'screenshot_max_width', fallback=0)
+THUMBNAIL_WIDTH = config.getint('Settings', 'thumbnail_width', fallback=0)
+THUMBNAIL_CACHE_DIR = config.get('Settings', 'thumbnail_cache_dir', fallback='thumbnail_cache')
+GALLERY_THUMBNAIL_WIDTH = config.getint('Settings', 'gallery_thumbnail_width', fallback=320)
+FALLBACK_IMAGE_MODE = config.get('Settings', 'fallback_image_mode', fallback='per_id')
+DEDUPE_SCREENSHOTS = config.getboolean('Settings', 'dedupe_screenshots', fallback=True)
+IMAGE_HASH_MAX_DISTANCE = config.getint('Settings', 'image_hash_max_distance', fallback=3)
+# 거의 같은 스크린샷 파일 삭제 (기본값은 삭제하지 않고 갤러리에서만 묶어서 표시)
+DEDUPE_REMOVE_FILES = config.getboolean('Settings', 'dedupe_remove_files', fallback=False)
+DEDUPE_REMOVE_MAX_DISTANCE = config.getint('Settings', 'dedupe_remove_max_distance', fallback=0)
+METRICS_FILE = config.get('Settings', 'metrics_file', fallback='stage_metrics.jsonl')
+METRICS_PROMETHEUS_FILE = config.get('Settings', 'metrics_prometheus_file', fallback='stage_metrics.prom')
+RENDER_PROFILE = config.get('Settings', 'render_profile', fallback='full')
+RESULT_FORMAT = config.get('Settings', 'result_format', fallback='parquet')
+EXPORT_XLSX = config.getboolean('Settings', 'export_xlsx', fallback=False)
+LIVE_RESULTS = config.getboolean('Settings', 'live_results', fallback=True)
+HISTORY_DIR = config.get('Settings', 'history_dir', fallback='history')
+HISTORY_AUTO_INGEST = config.getboolean('Settings', 'history_auto_ingest', fallback=True)
+
+# 도메인별 타임아웃, 재시도 및 회로 차단 설정
+MIN_TIMEOUT = config.getfloat('Retry', 'min_timeout', fallback=3.0)
+TIMEOUT_MULTIPLIER = config.getfloat('Retry', 'timeout_multiplier', fallback=3.0)
+LATENCY_PERCENTILE = config.getint('Retry', 'latency_percentile', fallback=95)
+CIRCUIT_FAILURE_THRESHOLD = config.getint('Retry', 'circuit_failure_threshold', fallback=5)
+CIRCUIT_COOLDOWN = config.getfloat('Retry', 'circuit_cooldown', fallback=300)
+MAX_RETRIES = config.getint('Retry', 'max_retries', fallback=2)
+RETRY_WORKERS = config.getint('Retry', 'retry_workers', fallback=2)
+RETRY_BACKOFF_BASE = config.getfloat('Retry', 'backoff_base', fallback=2.0)
+RETRY_BACKOFF_CAP = config.getfloat('Retry', 'backoff_cap', fallback=60.0)
 
 # 상태 코드 상수 정의
 STATUS_OK = "OK"
@@ -50,19 +102,54 @@ STATUS_YOUTUBE_UNAVAILABLE = "YOUTUBE_UNAVAILABLE"
 STATUS_ERROR = "ERROR"
 # STATUS_HOME_REDIRECT = "STATUS_HOME_REDIRECT"
 
+# 증분 검사용 결과 저장소 설정
+RESULT_STORE_PATH = config.get('Settings', 'result_store_path', fallback='results.sqlite')
+
+# 상태별 결과 유지 시간 (초) - 0이면 매번 다시 검사 (이전에 실패한 URL)
+RESULT_TTL_POLICY = {
+    status: config.getint('CacheTTL', status.lower(), fallback=default_ttl)
+    for status, default_ttl in (
+        (STATUS_OK, 7 * 24 * 3600),
+        (STATUS_REDIRECT, 3 * 24 * 3600),
+        (STATUS_CLIENT_ERROR, 0),
+        (STATUS_SERVER_ERROR, 0),
+        (STATUS_EMPTY_CONTENT, 0),
+        (STATUS_YOUTUBE_PRIVATE, 0),
+        (STATUS_YOUTUBE_DELETED, 0),
+        (STATUS_YOUTUBE_AGE_RESTRICTED, 0),
+        (STATUS_YOUTUBE_REGION_BLOCKED, 0),
+        (STATUS_YOUTUBE_EMBEDDING_DISABLED, 0),
+        (STATUS_YOUTUBE_UNAVAILABLE, 0),
+        (STATUS_ERROR, 0),
+    )
+}
+
 
 # 초기 디렉토리 및 파일 설정
-def setup_directories():
+# 증분 검사 모드에서는 기존 스크린샷을 재사용하므로 삭제하지 않음
+# 스크린샷 저장 디렉토리 변경 (샤드 작업자는 공유 작업 디렉토리 아래에 저장)
+def set_screenshot_dir(path):
+    global screenshot_dir
+    screenshot_dir = path
+    os.makedirs(screenshot_dir, exist_ok=True)
+
+def setup_directories(clear_screenshots=True):
     try:
         if os.path.exists("processed_data.xlsx"):
             os.remove("processed_data.xlsx")
-        if os.path.exists(screenshot_dir):
+        if clear_screenshots and os.path.exists(screenshot_dir):
             shutil.rmtree(screenshot_dir)
         os.makedirs(screenshot_dir, exist_ok=True)
         logging.info("디렉토리 설정 완료.")
     except Exception as e:
         logging.error(f"디렉토리 설정 실패: {str(e)}")
 
+# 렌더링 프로필 (리소스 차단, 페이지 로드 전략, 창 크기)
+render_profile = (
+    RenderProfile.from_config(config, RENDER_PROFILE)
+    if config.has_section(f"RenderProfile.{RENDER_PROFILE}") else RenderProfile()
+)
+
 # Selenium WebDriver 설정
 def configure_webdriver():
     chrome_options = Options()
@@ -71,10 +158,40 @@ def configure_webdriver():
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     # 추가적인 옵션 설정 가능
+    render_profile.apply_options(chrome_options)
     return chrome_options
 
 chrome_options = configure_webdriver()
 
+# 렌더링 프로필을 적용한 드라이버 풀 생성
+def create_driver_pool():
+    return DriverPool(
+        chrome_options, size=MAX_THREADS, max_uses=DRIVER_MAX_USES,
+        window_size=render_profile.window_size, setup=render_profile.setup_driver
+    )
+
+# 스크린샷 인코딩 풀 (브라우저 작업 스레드와 분리)
+screenshot_encoder = ScreenshotEncoder(
+    SCREENSHOT_ENCODER_WORKERS, SCREENSHOT_FORMAT, quality=85,
+    max_width=SCREENSHOT_MAX_WIDTH, thumbnail_width=THUMBNAIL_WIDTH,
+    thumbnail_cache=ThumbnailCache(THUMBNAIL_CACHE_DIR, GALLERY_THUMBNAIL_WIDTH)
+)
+
+# 도메인별 타임아웃 및 회로 차단 정책
+def create_domain_policy():
+    return DomainPolicy(
+        REQUEST_TIMEOUT, WAIT_FOR_PAGE_TIMEOUT, MIN_TIMEOUT, TIMEOUT_MULTIPLIER,
+        LATENCY_PERCENTILE, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN
+    )
+
+domain_policy = create_domain_policy()
+
+# 공유 대체 이미지 생성 시 중복 저장 방지용 잠금
+fallback_image_lock = threading.Lock()
+
+# 도메인별 요청 제한 스케줄러
+domain_scheduler = DomainScheduler(DOMAIN_MAX_CONCURRENCY, DOMAIN_REQUESTS_PER_SECOND)
+
 # URL 해시값 생성 함수
 def generate_hash(url):
     return hashlib.md5(url.encode('utf-8')).hexdigest()
@@ -104,6 +221,24 @@ def normalize_url_without_subdomain(url):
 
     return normalized_url
 
+# 중복 제거용 URL 정규화 함수
+# (서브도메인과 스킴을 유지하여 서로 다른 페이지가 합쳐지지 않도록 엄격하게 비교)
+def canonicalize_url(url):
+    parsed_url = urlparse(str(url).strip())
+    scheme = parsed_url.scheme.lower()
+    host = (parsed_url.hostname or '').lower()
+
+    # 기본 포트는 제거
+    port = parsed_url.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    # 경로의 마지막 '/' 제거, 쿼리 파라미터 정렬, 프래그먼트 제거
+    path = parsed_url.path.rstrip('/') or '/'
+    query = '&'.join(sorted(parsed_url.query.split('&'))) if parsed_url.query else ''
+
+    return urlunparse((scheme, host, path, '', query, ''))
+
 # 두 URL을 서브도메인 무시하고 비교
 def compare_without_subdomain(url1, url2):
     normalized_url1 = normalize_url_without_subdomain(url1)
@@ -121,13 +256,111 @@ def convert_png_to_jpg(png_path, jpg_path):
     except Exception as e:
         logging.error(f"PNG to JPG 변환 실패: {str(e)}")
 
+# 페이지 내부에서 실행되는 안정화 감지 스크립트
+# - MutationObserver로 DOM 변경을 감지
+# - fetch/XMLHttpRequest 진행 중 요청 수와 PerformanceObserver 리소스 완료 이벤트로 네트워크 유휴 상태 감지
+# - DOM 변경과 네트워크 활동이 quiet_window 동안 없으면 종료
+# - 문서 준비 조건(__READY_CONDITION__)은 페이지 로드 전략에 따라 page_stability_script에서 채움
+PAGE_STABILITY_SCRIPT = """
+var quietWindow = arguments[0];
+var timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+var lastActivity = start;
+var mutations = 0;
+var inflight = 0;
+
+function touch() { lastActivity = performance.now(); }
+
+var observer = new MutationObserver(function (records) { mutations += records.length; touch(); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+var perfObserver = null;
+try {
+    perfObserver = new PerformanceObserver(function () { touch(); });
+    perfObserver.observe({entryTypes: ['resource']});
+} catch (e) {}
+
+var originalFetch = window.fetch;
+if (originalFetch) {
+    window.fetch = function () {
+        inflight++; touch();
+        return originalFetch.apply(this, arguments).finally(function () { inflight--; touch(); });
+    };
+}
+var originalSend = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.send = function () {
+    inflight++; touch();
+    this.addEventListener('loadend', function () { inflight--; touch(); });
+    return originalSend.apply(this, arguments);
+};
+
+function finish(stable) {
+    observer.disconnect();
+    if (perfObserver) { perfObserver.disconnect(); }
+    if (originalFetch) { window.fetch = originalFetch; }
+    XMLHttpRequest.prototype.send = originalSend;
+    done({stable: stable, elapsed: performance.now() - start, mutations: mutations, inflight: inflight});
+}
+
+(function check() {
+    var now = performance.now();
+    if ((__READY_CONDITION__) && inflight <= 0 && now - lastActivity >= quietWindow) {
+        finish(true);
+    } else if (now - start >= timeout) {
+        finish(false);
+    } else {
+        setTimeout(check, Math.min(50, quietWindow));
+    }
+})();
+"""
+
+# 페이지 로드 전략별 문서 준비 조건 (JavaScript 식)
+# - normal: 모든 리소스 로드 완료, eager: DOM 구성 완료 (이미지 등은 기다리지 않음), none: 조건 없음
+READY_STATE_CONDITIONS = {
+    'normal': "document.readyState === 'complete'",
+    'eager': "document.readyState !== 'loading'",
+    'none': "true",
+}
+
+def ready_state_condition(page_load_strategy):
+    return READY_STATE_CONDITIONS.get(page_load_strategy, READY_STATE_CONDITIONS['normal'])
+
+def page_stability_script(page_load_strategy):
+    return PAGE_STABILITY_SCRIPT.replace('__READY_CONDITION__', ready_state_condition(page_load_strategy))
+
 # 페이지 완전 로딩 대기 함수
-def wait_for_page_load(driver, timeout=WAIT_FOR_PAGE_TIMEOUT, check_interval=0.5, stability_threshold=15):
+# - 문서 준비 조건은 렌더링 프로필의 페이지 로드 전략을 따름 (eager/none이면 전체 로드를 기다리지 않음)
+# - observer 모드: 페이지 내부에서 DOM 변경과 네트워크 활동이 멈출 때까지 이벤트 기반으로 대기
+# - polling 모드: 기존 방식 (DOM 요소 개수를 주기적으로 비교)
+def wait_for_page_load(driver, timeout=WAIT_FOR_PAGE_TIMEOUT, mode=None, quiet_window=None, page_load_strategy=None):
+    mode = mode or PAGE_STABILITY_MODE
+    quiet_window = PAGE_QUIET_WINDOW if quiet_window is None else quiet_window
+    page_load_strategy = page_load_strategy or render_profile.page_load_strategy
+    if mode == "polling":
+        wait_for_page_load_polling(driver, timeout, page_load_strategy=page_load_strategy)
+        return
+
     try:
-        # document.readyState가 'complete'가 될 때까지 대기
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
+        # 스크립트 타임아웃은 대기 시간보다 여유 있게 설정
+        driver.set_script_timeout(timeout + 5)
+        stability = driver.execute_async_script(
+            page_stability_script(page_load_strategy), int(quiet_window * 1000), int(timeout * 1000))
+        if not stability or not stability.get('stable'):
+            logging.warning("페이지가 지정된 시간 내에 안정화되지 않았습니다.")
+        return stability
+    except Exception as e:
+        # 스크립트 실행이 불가능한 페이지는 기존 방식으로 대체
+        logging.warning(f"이벤트 기반 안정화 감지 실패, polling 방식으로 대체합니다: {str(e)}")
+        wait_for_page_load_polling(driver, timeout, page_load_strategy=page_load_strategy)
+
+# 페이지 완전 로딩 대기 함수 (polling 방식)
+def wait_for_page_load_polling(driver, timeout=WAIT_FOR_PAGE_TIMEOUT, check_interval=0.5, stability_threshold=15,
+                               page_load_strategy='normal'):
+    try:
+        # 페이지 로드 전략의 문서 준비 조건을 만족할 때까지 대기
+        condition = ready_state_condition(page_load_strategy)
+        WebDriverWait(driver, timeout).until(lambda d: d.execute_script(f"return {condition}"))
 
         stable_count = 0
         last_dom_length = None
@@ -160,33 +393,61 @@ def handle_error(result, error_type, exception, error_message, default_image_pat
     # 대체 이미지 저장
     result['screenshot'] = save_default_image(default_image_path, result['id'])
 
+# 대체 이미지 크기 및 폰트 크기
+FALLBACK_IMAGE_SIZE = (1920, 1080)
+FALLBACK_FONT_SIZE = 150
+
+# 대체 이미지 폰트 (프로세스당 한 번만 로드)
+@functools.lru_cache(maxsize=1)
+def load_fallback_font():
+    try:
+        return ImageFont.truetype(DEFAULT_FONT_PATH, FALLBACK_FONT_SIZE)
+    except IOError:
+        return ImageFont.load_default()
+
+# "ERROR" 문구까지 그려진 기본 캔버스 (한 번만 생성, 사용 시 복사)
+@functools.lru_cache(maxsize=1)
+def fallback_base_image():
+    width, height = FALLBACK_IMAGE_SIZE
+    image = Image.new('RGB', FALLBACK_IMAGE_SIZE, color=(255, 255, 255))  # 흰색 배경의 기본 이미지
+    draw = ImageDraw.Draw(image)
+    font = load_fallback_font()
+    error_text = "ERROR"
+
+    text_bbox = draw.textbbox((0, 0), error_text, font=font)
+    text_width, text_height = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
+    draw.text(((width - text_width) / 2, (height - text_height) / 2 - 200), error_text, fill=(255, 0, 0), font=font)
+    return image
+
+# 모든 실패 행이 함께 참조하는 공유 대체 이미지 ("ERROR" 문구만 포함, ID 없음)
+def save_shared_default_image():
+    shared_image_path = os.path.join(screenshot_dir, "error.jpg")
+    with fallback_image_lock:
+        if not os.path.exists(shared_image_path):
+            fallback_base_image().save(shared_image_path, "JPEG", quality=85)
+            logging.info(f"공유 대체 이미지 생성 완료: {shared_image_path}")
+    return shared_image_path
+
 # 대체 이미지 생성 및 저장 함수
+# - per_id 모드: 캐시된 기본 캔버스를 복사하여 ID 문구만 추가로 그림
+#   (폰트, 위치, 색상, JPEG 품질 85가 기존과 같으므로 같은 Pillow 버전에서 기존 구현과 바이트 단위로 동일한 파일)
+# - shared 모드: ID 없는 error.jpg 하나만 저장하고 모든 실패 행이 같은 경로를 참조
 def save_default_image(default_image_path, unique_id):
     try:
-        # 대체 이미지 생성
-        image = Image.new('RGB', (1920, 1080), color=(255, 255, 255))  # 흰색 배경의 기본 이미지
+        if FALLBACK_IMAGE_MODE == "shared":
+            return save_shared_default_image()
+
+        # 캐시된 기본 캔버스 복사
+        image = fallback_base_image().copy()
+        width, height = FALLBACK_IMAGE_SIZE
 
-        # 이미지에 텍스트 추가를 위한 ImageDraw 객체 생성
+        # ID 문구 추가
         draw = ImageDraw.Draw(image)
-        error_text = "ERROR"
+        font = load_fallback_font()
         error_message = f"ID: {unique_id}"
-
-        # 폰트 설정
-        try:
-            font = ImageFont.truetype(DEFAULT_FONT_PATH, 150)
-        except IOError:
-            font = ImageFont.load_default()
-
-        # 텍스트 크기 계산
-        text_bbox = draw.textbbox((0, 0), error_text, font=font)
-        text_width, text_height = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
-
         message_bbox = draw.textbbox((0, 0), error_message, font=font)
         message_width, message_height = message_bbox[2] - message_bbox[0], message_bbox[3] - message_bbox[1]
-
-        # 중앙에 텍스트 배치
-        draw.text(((1920 - text_width) / 2, (1080 - text_height) / 2 - 200), error_text, fill=(255, 0, 0), font=font)
-        draw.text(((1920 - message_width) / 2, (1080 - message_height) / 2 + 100), error_message, fill=(0, 0, 0), font=font)
+        draw.text(((width - message_width) / 2, (height - message_height) / 2 + 100), error_message, fill=(0, 0, 0), font=font)
 
         # 파일 경로 생성 및 저장
         fallback_image_path = os.path.join(screenshot_dir, f"{unique_id}_error.jpg")
@@ -197,166 +458,470 @@ def save_default_image(default_image_path, unique_id):
         logging.error(f"대체 이미지 생성 오류: {str(e)}")
         return None
 
-# Full HTML에서 링크만 추출하는 함수 (To-do List 구현)
-def extract_links_from_html(html_content):
+# 링크로 취급하지 않는 스킴
+NON_HTTP_LINK_PREFIXES = ('javascript:', 'mailto:', 'tel:', 'data:', '#')
+
+# HTML 토크나이저 기반 링크 추출기
+# - feed()로 HTML을 조각 단위로 넣을 수 있어 전체 본문을 메모리에 올리지 않아도 됨
+# - <a>, <area>의 href만 외부 링크로 수집 (<link>, <script> 등 하위 리소스 제외)
+# - <base href>가 있으면 이후 상대 링크의 기준 URL로 사용
+# - 중복 링크는 처음 나온 순서대로 한 번만 수집
+class LinkExtractor(HTMLParser):
+    def __init__(self, base_url=None):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = []
+        self._seen = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'base':
+            href = dict(attrs).get('href')
+            if href and self.base_url:
+                self.base_url = urljoin(self.base_url, href.strip())
+            return
+        if tag not in ('a', 'area'):
+            return
+        href = (dict(attrs).get('href') or '').strip()
+        if not href or href.lower().startswith(NON_HTTP_LINK_PREFIXES):
+            return
+        link = urljoin(self.base_url, href) if self.base_url else href
+        link = link.split('#', 1)[0]
+        if link not in self._seen:
+            self._seen.add(link)
+            self.links.append(link)
+
+    handle_startendtag = handle_starttag
+
+# Full HTML에서 링크만 추출하는 함수 (base_url이 주어지면 절대 URL로 변환)
+def extract_links_from_html(html_content, base_url=None):
     try:
-        # 정규식을 이용하여 모든 링크 추출
-        links = re.findall(r'href=["\'](.*?)["\']', html_content, re.IGNORECASE)
-        logging.info(f"추출된 링크 수: {len(links)}")
-        return links
+        extractor = LinkExtractor(base_url)
+        extractor.feed(html_content)
+        extractor.close()
+        logging.info(f"추출된 링크 수: {len(extractor.links)}")
+        return extractor.links
     except Exception as e:
         logging.error(f"HTML에서 링크 추출 실패: {str(e)}")
         return []
 
-# 유튜브 상태 감지 함수
-def detect_youtube_status(html_content):
-    lower_text = html_content.lower()
-    
-    # 유튜브 비공개 동영상 감지
-    if re.search(r'(비공개|login_required)', lower_text):
-        return STATUS_YOUTUBE_PRIVATE, "유튜브 비공개 동영상 감지"
-    
-    # 유튜브 삭제된 동영상 감지
-    if re.search(r'(삭제한|removed by the user)', lower_text):
-        return STATUS_YOUTUBE_DELETED, "유튜브 삭제된 동영상 감지"
-    
-    # 유튜브 연령 제한 동영상 감지
-    if re.search(r'(age-restricted|연령 제한)', lower_text):
-        return STATUS_YOUTUBE_AGE_RESTRICTED, "유튜브 연령 제한 동영상 감지"
-    
-    # 유튜브 지역 제한 동영상 감지
-    if re.search(r'(not available in your country|현재 국가에서 사용할 수 없습니다)', lower_text):
-        return STATUS_YOUTUBE_REGION_BLOCKED, "유튜브 지역 제한 동영상 감지"
-    
+# ------------------------ 렌더된 HTML 분석 ------------------------
+
+# 미리 컴파일된 패턴
+BODY_PATTERN = re.compile(r'<body[^>]*>(.*?)</body>', re.DOTALL | re.IGNORECASE)
+CONTENT_TAG_PATTERN = re.compile(r'<(div|p|span|h[1-6]|article|section|main|nav|header|footer|aside)[^>]*>', re.IGNORECASE)
+# 스크립트, 스타일 블록과 태그를 한 번에 제거
+NON_VISIBLE_PATTERN = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>', re.DOTALL | re.IGNORECASE)
+
+# 유튜브 상태 패턴 (우선순위 순서)
+YOUTUBE_STATUS_PATTERNS = [
+    ('private', r'비공개|login_required', STATUS_YOUTUBE_PRIVATE, "유튜브 비공개 동영상 감지"),
+    ('deleted', r'삭제한|removed by the user', STATUS_YOUTUBE_DELETED, "유튜브 삭제된 동영상 감지"),
+    ('age_restricted', r'age-restricted|연령 제한', STATUS_YOUTUBE_AGE_RESTRICTED, "유튜브 연령 제한 동영상 감지"),
+    ('region_blocked', r'not available in your country|현재 국가에서 사용할 수 없습니다', STATUS_YOUTUBE_REGION_BLOCKED, "유튜브 지역 제한 동영상 감지"),
     # 유튜브 임베딩 비활성화 감지
-    # if re.search(r'(embedding has been disabled|임베딩이 비활성화되었습니다)', lower_text):
-    #     return STATUS_YOUTUBE_EMBEDDING_DISABLED, "유튜브 임베딩 비활성화 감지"
-    
-    # 유튜브 기타 사용 불가 상태 감지
-    if re.search(r'(video unavailable|동영상 사용 불가)', lower_text):
-        return STATUS_YOUTUBE_UNAVAILABLE, "유튜브 동영상 사용 불가 감지"
-    
+    # ('embedding_disabled', r'embedding has been disabled|임베딩이 비활성화되었습니다', STATUS_YOUTUBE_EMBEDDING_DISABLED, "유튜브 임베딩 비활성화 감지"),
+    ('unavailable', r'video unavailable|동영상 사용 불가', STATUS_YOUTUBE_UNAVAILABLE, "유튜브 동영상 사용 불가 감지"),
+]
+# 모든 유튜브 패턴을 하나의 정규식으로 결합 (한 번의 탐색으로 감지된 그룹을 모두 수집)
+YOUTUBE_COMBINED_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _, _ in YOUTUBE_STATUS_PATTERNS),
+    re.IGNORECASE
+)
+
+# 렌더된 HTML에서 빈 콘텐츠 신호와 유튜브 상태를 한 번에 계산
+def analyze_html(html_content, check_youtube=False):
+    analysis = {
+        'html_length': len(html_content.strip()),
+        'has_body': False,
+        'has_content_tag': False,
+        'visible_text_length': 0,
+        'content_fingerprint': None,
+        'is_empty': True,
+        'youtube_status': None,
+        'youtube_log': None,
+    }
+
+    # <body> 태그 내에 주요 콘텐츠 태그가 있는지 검사
+    body_match = BODY_PATTERN.search(html_content)
+    if body_match:
+        analysis['has_body'] = True
+        analysis['has_content_tag'] = CONTENT_TAG_PATTERN.search(body_match.group(1)) is not None
+
+    # 스크립트나 스타일 태그 외에 실제 텍스트 길이와 텍스트 지문 (실행 간 변경 감지용)
+    visible_text = NON_VISIBLE_PATTERN.sub('', html_content).strip()
+    analysis['visible_text_length'] = len(visible_text)
+    analysis['content_fingerprint'] = hashlib.md5(' '.join(visible_text.split()).encode('utf-8')).hexdigest()
+
+    # 빈 콘텐츠 판단 (200자 미만, body 없음, 콘텐츠 태그 없음, 보이는 텍스트 50자 미만)
+    analysis['is_empty'] = (
+        analysis['html_length'] < 200
+        or not analysis['has_body']
+        or not analysis['has_content_tag']
+        or analysis['visible_text_length'] < 50
+    )
+
+    if check_youtube:
+        analysis['youtube_status'], analysis['youtube_log'] = match_youtube_status(html_content)
+
+    return analysis
+
+# 결합된 패턴으로 감지된 유튜브 상태 중 우선순위가 가장 높은 상태 반환
+def match_youtube_status(html_content):
+    found = {match.lastgroup for match in YOUTUBE_COMBINED_PATTERN.finditer(html_content)}
+    for name, _, status, log in YOUTUBE_STATUS_PATTERNS:
+        if name in found:
+            return status, log
     return STATUS_OK, "정상 응답"
 
+# 유튜브 상태 감지 함수
+def detect_youtube_status(html_content):
+    return match_youtube_status(html_content)
+
 # 빈 콘텐츠 감지 함수 (렌더된 HTML 기반으로 수정)
 def is_empty_content_rendered(driver):
     try:
         # 렌더된 HTML 가져오기
-        rendered_html = driver.page_source
-
-        # 기본 빈도 검사
-        if len(rendered_html.strip()) == 0:
-            return True
-
-        # 콘텐츠 길이 기준 추가 (예: 200자 미만)
-        if len(rendered_html.strip()) < 200:
-            return True
-
-        # <body> 태그 내에 실제 콘텐츠가 있는지 검사
-        body_match = re.search(r'<body[^>]*>(.*?)</body>', rendered_html, re.DOTALL | re.IGNORECASE)
-        if body_match:
-            body_content = body_match.group(1).strip()
-            # 주요 콘텐츠 태그가 있는지 확인
-            if not re.search(r'<(div|p|span|h[1-6]|article|section|main|nav|header|footer|aside)[^>]*>', body_content, re.IGNORECASE):
-                return True
-        else:
-            # <body> 태그가 없으면 빈 콘텐츠로 간주
-            return True
-
-        # 추가적인 텍스트 기반 검사 (예: 스크립트나 스타일 태그 외에 실제 텍스트가 있는지)
-        visible_text = re.sub(r'<script[^>]*>.*?</script>', '', rendered_html, flags=re.DOTALL | re.IGNORECASE)
-        visible_text = re.sub(r'<style[^>]*>.*?</style>', '', visible_text, flags=re.DOTALL | re.IGNORECASE)
-        visible_text = re.sub(r'<[^>]+>', '', visible_text).strip()
-        if len(visible_text) < 50:
-            return True
-
-        return False
+        return analyze_html(driver.page_source)['is_empty']
     except Exception as e:
         logging.error(f"렌더된 HTML에서 빈 콘텐츠 검사 실패: {str(e)}")
         return False
 
-# 링크를 처리하는 함수 (표준화된 용어 사용 및 유튜브 상태 세분화)
-def process_link(row):
-    driver = webdriver.Chrome(options=chrome_options)
-    result = row.copy()
+# 1단계: HTTP 상태 확인 (HEAD 우선, 지원하지 않거나 오류 응답이면 GET으로 재확인)
+# headers에 조건부 요청 헤더(If-None-Match 등)를 주면 변경이 없을 때 304 응답
+def probe_http_status(url, timeout=REQUEST_TIMEOUT, retry_after=True, headers=None):
+    response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+    if response.status_code >= 400:
+        # 일부 서버는 HEAD 요청을 거부하므로 GET으로 다시 확인 (본문은 읽지 않음)
+        response.close()
+        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True)
+        response.close()
+
+    # 요청 제한 응답(429/503)의 Retry-After를 따라 도메인 요청을 보류한 뒤 한 번 재시도
+    # 보류 시간이 RETRY_AFTER_MAX를 넘으면 도메인을 보류하지 않고 응답을 그대로 결과로 사용
+    # (도메인 슬롯을 잡은 채 오래 대기하여 전체 실행이 멈추지 않도록)
+    if retry_after and response.status_code in (429, 503):
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is not None:
+            domain = extract_main_domain(url)
+            if delay > RETRY_AFTER_MAX:
+                logging.warning(f"Retry-After {delay:.0f}초가 최대 {RETRY_AFTER_MAX}초를 넘어 재시도하지 않습니다: {url}")
+                return response
+            domain_scheduler.defer(domain, delay)
+            domain_scheduler.throttle(domain)
+            return probe_http_status(url, timeout, retry_after=False, headers=headers)
+    return response
+
+# HTTP 응답 결과를 상태 코드로 분류하고 최종 URL 반환
+def classify_http_response(result, url, status_code, history_codes, history_urls, final_url):
+    result['redirect_codes'] = history_codes if history_codes else "없음"
+
+    # 최종 응답 상태 코드 처리
+    final_url = final_url if history_codes else url  # 최종 URL 설정
+
+    if 400 <= status_code < 500:
+        result['status'] = STATUS_CLIENT_ERROR
+        result['log'] = f"클라이언트 오류 코드 {status_code} - 리소스를 찾을 수 없음"
+    elif 500 <= status_code < 600:
+        result['status'] = STATUS_SERVER_ERROR
+        result['log'] = f"서버 오류 코드 {status_code} - 서버 내부 오류"
+    elif history_codes:
+        # 리다이렉트가 존재하는 경우
+        result['status'] = STATUS_REDIRECT
+        redirect_chain = " -> ".join(history_urls + [final_url])
+        result['log'] = f"리다이렉트 코드 {history_codes} -> 리다이렉트 경로: {redirect_chain}"
+
+        # 홈 도메인으로 리다이렉트된 경우 체크
+        # initial_domain = extract_main_domain(url)
+        # final_domain = extract_main_domain(final_url)
+        # if initial_domain == final_domain and urlparse(final_url).path == '/':
+        #     result['status'] = STATUS_HOME_REDIRECT
+        #     result['log'] += " - 홈 도메인으로 리다이렉트됨"
+    else:
+        result['status'] = STATUS_OK
+        result['log'] = "200 OK - 정상 응답"
+
+    return final_url
+
+# 2단계: 브라우저 렌더링 후 빈 콘텐츠, 유튜브 상태 검사 및 스크린샷 저장
+def render_and_inspect(driver, result, row, final_url, spans=None):
     url = row['url']
-    try:
-        # WebDriver 설정
-        driver.set_window_size(1920, 1080)
-        
-        # Selenium을 이용하여 페이지 로드 및 대기
+    spans = spans if spans is not None else StageSpans()
+    domain = extract_main_domain(url)
+
+    # 도메인별로 관측된 로딩 시간에 맞춘 타임아웃 적용
+    page_timeout = domain_policy.page_timeout(domain)
+    driver.set_page_load_timeout(page_timeout)
+
+    # Selenium을 이용하여 페이지 로드 및 대기 (도메인 요청 간격 준수)
+    domain_scheduler.throttle(domain)
+    render_profile.reset_transfer_log(driver)
+    with spans.span('page_load'):
         driver.get(url)
-        wait_for_page_load(driver)
+        render_profile.wait_for_navigation(driver, page_timeout)
+    with spans.span('page_wait'):
+        wait_for_page_load(driver, timeout=page_timeout)
+    result['transfer_bytes'], result['blocked_requests'] = render_profile.collect_transfer(driver)
 
-        # 리다이렉트를 허용하고 요청 시도
-        response = requests.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+    # 리다이렉트 여부와 상관없이 최종 도착한 페이지 상태 검사
+    # 렌더된 HTML은 한 번만 가져와서 빈 콘텐츠와 유튜브 상태를 함께 분석
+    is_youtube = "youtube.com" in urlparse(final_url).netloc
+    try:
+        with spans.span('content_analysis'):
+            analysis = analyze_html(driver.page_source, check_youtube=is_youtube)
+    except Exception as e:
+        logging.error(f"렌더된 HTML에서 빈 콘텐츠 검사 실패: {str(e)}")
+        analysis = {'is_empty': False, 'youtube_status': STATUS_OK, 'youtube_log': "정상 응답"}
+    result['visible_text_length'] = analysis.get('visible_text_length')
+    result['content_fingerprint'] = analysis.get('content_fingerprint')
 
-        # 리다이렉트 히스토리에서 상태 코드 및 URL 수집
-        redirect_codes = [resp.status_code for resp in response.history]
-        redirect_urls = [resp.url for resp in response.history]
-        result['redirect_codes'] = redirect_codes if redirect_codes else "없음"
-
-        # 최종 응답 상태 코드 처리
-        final_url = response.url if response.history else url  # 최종 URL 설정
-        
-        if 400 <= response.status_code < 500:
-            result['status'] = STATUS_CLIENT_ERROR
-            result['log'] = f"클라이언트 오류 코드 {response.status_code} - 리소스를 찾을 수 없음"
-        elif 500 <= response.status_code < 600:
-            result['status'] = STATUS_SERVER_ERROR
-            result['log'] = f"서버 오류 코드 {response.status_code} - 서버 내부 오류"
-        elif response.history:
-            # 리다이렉트가 존재하는 경우
-            result['status'] = STATUS_REDIRECT
-            redirect_chain = " -> ".join(redirect_urls + [final_url])
-            result['log'] = f"리다이렉트 코드 {redirect_codes} -> 리다이렉트 경로: {redirect_chain}"
-
-            # 홈 도메인으로 리다이렉트된 경우 체크
-            # initial_domain = extract_main_domain(url)
-            # final_domain = extract_main_domain(final_url)
-            # if initial_domain == final_domain and urlparse(final_url).path == '/':
-            #     result['status'] = STATUS_HOME_REDIRECT
-            #     result['log'] += " - 홈 도메인으로 리다이렉트됨"
-        else:
-            result['status'] = STATUS_OK
-            result['log'] = "200 OK - 정상 응답"
-
-        # 400, 500번대 에러가 아니면 추가 검사 진행
-        if result['status'] == STATUS_OK or result['status'] == STATUS_REDIRECT:
-            # 리다이렉트 여부와 상관없이 최종 도착한 페이지 상태 검사
-            if is_empty_content_rendered(driver):
-                result['status'] = STATUS_EMPTY_CONTENT
-                result['log'] += " - 콘텐츠 없음 (빈 페이지)"
-            else:
-                # 유튜브 URL인지 확인
-                if "youtube.com" in urlparse(final_url).netloc:
-                    youtube_status, youtube_log = detect_youtube_status(driver.page_source)
-                    result['status'] = youtube_status
-                    result['log'] += f" - {youtube_log}"
-                else:
-                    result['status'] = STATUS_OK
-                    result['log'] += " - 정상 응답"
+    if analysis['is_empty']:
+        result['status'] = STATUS_EMPTY_CONTENT
+        result['log'] += " - 콘텐츠 없음 (빈 페이지)"
+    elif is_youtube:
+        result['status'] = analysis['youtube_status']
+        result['log'] += f" - {analysis['youtube_log']}"
+    else:
+        result['status'] = STATUS_OK
+        result['log'] += " - 정상 응답"
 
-        result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # 스크린샷을 메모리로 캡처하고 인코딩은 별도 풀에서 처리 (브라우저는 바로 다음 URL 처리)
+    url_hash = generate_hash(url)
+    current_time = datetime.now().strftime('%Y%m%d_%H%M%S%f')[:-3]
+    screenshot_base_path = os.path.join(screenshot_dir, f"{row['id']}_{url_hash}_{current_time}")
 
-        # Selenium을 이용한 스크린샷 저장
-        url_hash = generate_hash(url)
-        current_time = datetime.now().strftime('%Y%m%d_%H%M%S%f')[:-3]
-        screenshot_png_path = os.path.join(screenshot_dir, f"{row['id']}_{url_hash}_{current_time}.png")
-        screenshot_jpg_path = os.path.join(screenshot_dir, f"{row['id']}_{url_hash}_{current_time}.jpg")
+    with spans.span('screenshot_capture'):
+        png_bytes = driver.get_screenshot_as_png()
+    screenshot_paths = screenshot_encoder.paths(screenshot_base_path)
+    result['screenshot'] = screenshot_paths['screenshot']
+    result['thumbnail'] = screenshot_paths['thumbnail']
+    result['_screenshot_future'] = screenshot_encoder.submit(png_bytes, screenshot_base_path)
 
-        driver.save_screenshot(screenshot_png_path)
-        convert_png_to_jpg(screenshot_png_path, screenshot_jpg_path)
+# 스크린샷 인코딩 완료 대기 (실패 시 대체 이미지로 교체)
+def resolve_screenshot(result, spans=None):
+    if '_screenshot_future' not in result:
+        return result
+    future = result.pop('_screenshot_future')
+    try:
+        encoded = future.result()
+        result['dhash'] = encoded['dhash']
+        if spans is not None:
+            spans.add('screenshot_encode', encoded['encode_time'])
+    except Exception as e:
+        logging.error(f"스크린샷 인코딩 실패: {str(e)}")
+        result['screenshot'] = save_default_image(screenshot_dir, result['id'])
+        result['thumbnail'] = None
+    return result
 
-        result['screenshot'] = screenshot_jpg_path
+# 작업 스레드에서 돌아온 결과 마무리 (스크린샷 인코딩 대기, 단계별 소요 시간 기록)
+def finalize_result(result, metrics=None):
+    spans = result.pop('_spans') if '_spans' in result else StageSpans()
+    if '_transient' in result:
+        result.pop('_transient')
+    result = resolve_screenshot(result, spans)
+    spans.apply(result)
+    url = result['url']
+    domain_policy.record_latency(extract_main_domain(url), spans.durations)
+    if metrics is not None:
+        metrics.record(url, extract_main_domain(url), result.get('status'), spans.durations)
+    return result
 
-    except requests.exceptions.RequestException as e:
-        handle_error(result, "HTTP 요청", e, "HTTP 오류", screenshot_dir)
+# 일시적 오류(시간 초과, 연결 실패) 표시 및 도메인 실패 기록
+def mark_transient_failure(result, url):
+    result['_transient'] = True
+    domain_policy.record_failure(extract_main_domain(url))
+
+# 회로가 열린 도메인의 URL은 요청 없이 오류로 처리
+def short_circuit_result(result, domain):
+    result['status'] = STATUS_ERROR
+    result['log'] = f"오류 (도메인 응답 없음: {domain} 연속 실패로 요청 생략)"
+    result['screenshot'] = save_default_image(screenshot_dir, result['id'])
+    result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return result
+
+# 드라이버를 확보하여 2단계 검사를 수행하고 소요 시간 기록
+def render_link(row, result, final_url, driver_pool=None, spans=None):
+    spans = spans if spans is not None else StageSpans()
+    render_start = time.perf_counter()
+
+    # 드라이버 풀이 주어지면 재사용 드라이버를 대여, 없으면 단독 드라이버 생성
+    with spans.span('driver_acquire'):
+        if driver_pool is not None:
+            driver = driver_pool.acquire()
+        else:
+            driver = webdriver.Chrome(options=chrome_options)
+            render_profile.setup_driver(driver)
+    driver_broken = False
+    try:
+        render_and_inspect(driver, result, row, final_url, spans)
     except Exception as e:
+        # 페이지 로딩 시간 초과는 일시적 오류로 재시도 대상
+        # 그 외 WebDriver 오류는 드라이버 크래시로 간주하여 풀에서 교체
+        if isinstance(e, TimeoutException):
+            mark_transient_failure(result, row['url'])
+        else:
+            driver_broken = isinstance(e, WebDriverException)
         handle_error(result, "처리 중", e, "스크린샷 오류", screenshot_dir)
     finally:
-        driver.quit()
+        result['render_time'] = round(time.perf_counter() - render_start, 3)
+        if driver_pool is not None:
+            driver_pool.release(driver, broken=driver_broken)
+        else:
+            driver.quit()
 
+# 저장된 ETag/Last-Modified로 조건부 요청 헤더 구성 (없으면 None)
+def conditional_headers(cached):
+    headers = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    return headers or None
+
+# 검증 헤더 없이 재사용할 수 있는지 확인 (이전 결과가 정상이고 1단계 결과가 같을 때)
+def unchanged_without_validators(result, cached, headers):
+    return (
+        cached is not None and headers is None
+        and cached['status'] in (STATUS_OK, STATUS_REDIRECT)
+        and result['status'] == cached['status']
+        and result['redirect_codes'] == cached['redirect_codes']
+    )
+
+# 변경 없음(304)이 확인된 URL의 이전 결과와 스크린샷 재사용
+def reuse_cached_result(result, cached):
+    for field in ('redirect_codes', 'status', 'screenshot', 'thumbnail', 'dhash',
+                  'visible_text_length', 'content_fingerprint'):
+        result[field] = cached[field]
+    result['log'] = f"{cached['log']} - 변경 없음 (이전 결과 재사용)"
+    result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return result
+
+# 증분 검사: 유지 시간 이내이고 변경되지 않은 URL은 이전 결과와 스크린샷을 재사용
+# - 재사용할 결과가 있을 때만 1단계 확인 요청에 조건부 헤더를 붙임 (별도 요청 없음)
+# - 검증 헤더가 없는 페이지는 이전 결과가 정상이고 1단계 결과가 같으면 유지 시간 동안 재사용
+# - 새로 검사한 결과는 스크린샷 인코딩까지 마친 뒤 저장 (대체 이미지로 바뀐 경로, dhash 포함)
+def process_link_incremental(row, result_store, driver_pool=None):
+    url = row['url']
+    url_hash = generate_hash(url)
+    cached = result_store.get(url_hash)
+    reusable = (
+        cached is not None
+        and result_store.is_fresh(cached)
+        and cached['screenshot'] and os.path.exists(cached['screenshot'])
+    )
+
+    validators = {}
+    result = process_link(row, driver_pool, cached if reusable else None, validators)
+    if validators.get('not_modified'):
+        result_store.touch(url_hash)
+        return result
+
+    # 일시적 오류 결과는 재시도되므로 저장하지 않음
+    if validators and not result.get('_transient'):
+        result = resolve_screenshot(result, result['_spans'])
+        result_store.put(
+            url_hash, url, result,
+            etag=validators.get('etag'),
+            last_modified=validators.get('last_modified'),
+        )
+    return result
+
+# 검사 결과로 채워지는 필드 (나머지 필드는 각 행의 원래 값 유지)
+CHECK_RESULT_FIELDS = (
+    'status', 'log', 'redirect_codes', 'last_checked', 'screenshot', 'thumbnail', 'dhash',
+    'visible_text_length', 'content_fingerprint', 'probe_time', 'render_time',
+    'transfer_bytes', 'blocked_requests'
+)
+# 숫자로 저장하는 결과 열 (단계별 소요 시간 열 포함)
+NUMERIC_RESULT_FIELDS = ('visible_text_length', 'probe_time', 'render_time', 'transfer_bytes', 'blocked_requests') + SPAN_FIELDS
+
+# 정규화된 URL 기준으로 행을 묶음 (입력 순서 유지)
+# 비어 있거나 숫자인 URL도 문자열로 맞춰 각 행이 오류 결과로 처리되도록 함
+def group_rows_by_url(df):
+    df = df.copy()
+    df['url'] = df['url'].fillna('').astype(str).str.strip()
+    url_groups = {}
+    for _, row in df.iterrows():
+        url_groups.setdefault(canonicalize_url(row['url']), []).append(row)
+    return url_groups
+
+# 대표 행의 검사 결과를 같은 URL을 참조하는 각 행의 레코드로 복사
+# 대표 행 ID가 그려진 대체 이미지는 나머지 행에 그대로 복사하지 않고 행마다 새로 생성
+def fan_out_result(result, rows):
+    representative_fallback = os.path.join(screenshot_dir, f"{rows[0]['id']}_error.jpg")
+    per_row_fallback = len(rows) > 1 and result.get('screenshot') == representative_fallback
+    records = []
+    for i, row in enumerate(rows):
+        record = result.copy()
+        for column in row.index:
+            if column not in CHECK_RESULT_FIELDS:
+                record[column] = row[column]
+        if per_row_fallback and i > 0:
+            record['screenshot'] = save_default_image(screenshot_dir, row['id'])
+        records.append(record)
+    return records
+
+# 링크를 처리하는 함수 (표준화된 용어 사용 및 유튜브 상태 세분화)
+# 1단계 HTTP 확인에서 4xx/5xx로 분류된 URL은 브라우저 렌더링을 건너뜀
+# cached가 주어지면 1단계 요청을 조건부로 보내고 304이면 이전 결과 재사용
+# validators가 주어지면 응답의 ETag, Last-Modified, 변경 없음 여부를 기록
+def process_link(row, driver_pool=None, cached=None, validators=None):
+    result = row.copy()
+    url = row['url']
+    # 단계별 소요 시간은 finalize_result에서 결과 열과 지표 파일로 기록
+    spans = StageSpans()
+    result['_spans'] = spans
+    result['probe_time'] = None
+    result['render_time'] = None
+    result['screenshot'] = None
+    result['thumbnail'] = None
+    result['dhash'] = None
+    result['transfer_bytes'] = None
+    result['blocked_requests'] = None
+
+    # 연속 실패로 차단된 도메인은 요청하지 않음
+    domain = extract_main_domain(url)
+    if not domain_policy.try_acquire_probe(domain):
+        return short_circuit_result(result, domain)
+
+    try:
+        # 1단계: 리다이렉트를 허용하고 요청 시도 (도메인별 타임아웃 적용)
+        headers = conditional_headers(cached) if cached is not None else None
+        with spans.span('probe'):
+            response = probe_http_status(url, timeout=domain_policy.request_timeout(domain), headers=headers)
+        domain_policy.record_success(domain)
+
+        if validators is not None:
+            validators['etag'] = response.headers.get('ETag')
+            validators['last_modified'] = response.headers.get('Last-Modified')
+            validators['not_modified'] = headers is not None and response.status_code == 304
+            if validators['not_modified']:
+                return reuse_cached_result(result, cached)
+
+        # 리다이렉트 히스토리에서 상태 코드 및 URL 수집
+        final_url = classify_http_response(
+            result, url, response.status_code,
+            [resp.status_code for resp in response.history],
+            [resp.url for resp in response.history],
+            response.url
+        )
+
+        # ETag/Last-Modified가 없는 페이지는 304를 받을 수 없으므로
+        # 유지 시간 이내의 정상 결과이고 1단계 결과(상태, 리다이렉트)가 같으면 이전 결과 재사용
+        if validators is not None and unchanged_without_validators(result, cached, headers):
+            validators['not_modified'] = True
+            return reuse_cached_result(result, cached)
+    except requests.exceptions.RequestException as e:
+        if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            mark_transient_failure(result, url)
+        handle_error(result, "HTTP 요청", e, "HTTP 오류", screenshot_dir)
+        result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return result
+
+    # 400, 500번대 에러가 아니면 2단계 브라우저 검사 진행
+    if result['status'] in (STATUS_OK, STATUS_REDIRECT):
+        render_link(row, result, final_url, driver_pool, spans)
+
+    result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     return result
 
 # 실행 시간을 기록하는 데코레이터
@@ -372,30 +937,118 @@ def time_logger(func):
         return result
     return wrapper
 
+# 도메인 슬롯을 확보한 뒤 대표 행 검사
+# 예상하지 못한 예외도 해당 URL의 오류 결과로 기록하여 전체 실행이 중단되지 않도록 함
+def check_url_group(row, driver_pool, result_store=None):
+    try:
+        with domain_scheduler.slot(extract_main_domain(row['url'])):
+            if result_store is not None:
+                return process_link_incremental(row, result_store, driver_pool)
+            return process_link(row, driver_pool)
+    except Exception as e:
+        result = row.copy()
+        for field in CHECK_RESULT_FIELDS:
+            result[field] = None
+        handle_error(result, "처리 중", e, "처리 오류", screenshot_dir)
+        result['last_checked'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return result
+
+# 백오프 대기 후 재검사 (재시도 전용 작업자에서 실행)
+def retry_url_group(row, driver_pool, result_store, delay):
+    time.sleep(delay)
+    return check_url_group(row, driver_pool, result_store)
+
+# 행 묶음을 병렬로 검사하여 완료되는 순서대로 결과 레코드 반환
+# 같은 URL을 참조하는 행은 한 번만 검사하고 결과를 각 행에 복사
+# 도메인을 번갈아 제출하여 한 호스트에 작업자가 몰리지 않도록 함
+# 일시적 오류는 작업자 수가 적은 별도 재시도 큐에서 백오프 후 다시 검사
+def iter_link_results(df, driver_pool, result_store=None, metrics=None):
+    url_groups = group_rows_by_url(df)
+    logging.info(f"전체 {len(df)}행 중 고유 URL {len(url_groups)}개 검사")
+    print(f"전체 {len(df)}행 중 고유 URL {len(url_groups)}개 검사")
+
+    ordered_groups = interleave_by_domain(url_groups.values(), lambda rows: extract_main_domain(rows[0]['url']))
+    with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor, \
+            ThreadPoolExecutor(max_workers=RETRY_WORKERS, thread_name_prefix='retry') as retry_executor:
+        pending = {}
+        for rows in ordered_groups:
+            future = executor.submit(check_url_group, rows[0], driver_pool, result_store)
+            pending[future] = (rows, 0)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rows, attempt = pending.pop(future)
+                result = future.result()
+                domain = extract_main_domain(rows[0]['url'])
+                if result.get('_transient') and attempt < MAX_RETRIES and domain_policy.state(domain) != CIRCUIT_OPEN:
+                    delay = backoff_delay(attempt, RETRY_BACKOFF_BASE, RETRY_BACKOFF_CAP)
+                    logging.info(f"일시적 오류 재시도 {attempt + 1}/{MAX_RETRIES} ({delay:.1f}초 후): {rows[0]['url']}")
+                    retry_future = retry_executor.submit(retry_url_group, rows[0], driver_pool, result_store, delay)
+                    pending[retry_future] = (rows, attempt + 1)
+                    continue
+                yield from fan_out_result(finalize_result(result, metrics), rows)
+
+# 처리 결과 마무리 - 유사 스크린샷 분류, 결과 파일 저장, 이력 저장소 추가 (샤드 병합에서도 사용)
+def save_processed_results(processed_df, output_base, incremental=False):
+    # 유사 스크린샷은 클러스터별 대표 이미지 하나만 유지 (증분 모드에서는 캐시된 파일 보존)
+    if DEDUPE_SCREENSHOTS:
+        processed_df = dedupe_screenshots(
+            processed_df, IMAGE_HASH_MAX_DISTANCE,
+            remove_files=DEDUPE_REMOVE_FILES and not incremental,
+            remove_max_distance=DEDUPE_REMOVE_MAX_DISTANCE,
+        )
+    output_file = write_results(processed_df, output_base, RESULT_FORMAT, EXPORT_XLSX)
+    logging.info(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+    print(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+
+    # 이번 실행 결과를 이력 저장소에 추가 (추이 차트용)
+    if HISTORY_AUTO_INGEST:
+        HistoryStore(HISTORY_DIR).ingest('.')
+    return output_file
+
 # 메인 처리 함수 - 병렬로 링크 처리
 @time_logger
-def check_links(input_file="test_data.xlsx"):
+def check_links(input_file="test_data.xlsx", incremental=False):
     try:
-        # 현재 날짜와 시간을 가져와서 파일 이름 생성
+        # 현재 날짜와 시간을 가져와서 파일 이름 생성 (확장자는 결과 형식에 따라 결정)
         current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"processed_data_{current_time}.xlsx"
+        output_base = f"processed_data_{current_time}"
 
         df = pd.read_excel(input_file)
         # 필요한 경우 특정 행 필터링
         # df = df[df['id'].astype(str).str.startswith('F차0925006') | df['id'].astype(str).str.startswith('E국0926003')]
         # df = df[df['id'].astype(str).str.startswith('T테0101037')]
         processed_data = []
-        setup_directories()
+        setup_directories(clear_screenshots=not incremental)
+        result_store = ResultStore(RESULT_STORE_PATH, RESULT_TTL_POLICY) if incremental else None
+        domain_policy.load_history(METRICS_FILE)
+        metrics = StageMetrics(METRICS_FILE)
 
-        with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            futures = [executor.submit(process_link, row) for _, row in df.iterrows()]
-            for future in as_completed(futures):
-                processed_data.append(future.result())
+        # 완료된 결과는 바로 live 파일에 추가하여 대시보드에서 진행 상황 확인
+        live_writer = LiveResultWriter(output_base) if LIVE_RESULTS else None
+
+        # 워커 수만큼 드라이버를 미리 확보하지 않고, 필요할 때 생성하여 재사용
+        try:
+            with create_driver_pool() as driver_pool:
+                for record in iter_link_results(df, driver_pool, result_store, metrics):
+                    processed_data.append(record)
+                    if live_writer is not None:
+                        live_writer.write(record)
+                driver_pool.log_stats()
+        finally:
+            if live_writer is not None:
+                live_writer.close()
+        render_profile.log_stats()
+        screenshot_encoder.shutdown()
+        domain_scheduler.log_stats()
+        domain_policy.log_stats()
+        metrics.write_summary(METRICS_PROMETHEUS_FILE)
+        metrics.close()
+        if result_store is not None:
+            result_store.close()
 
-        processed_df = pd.DataFrame(processed_data)
-        processed_df.to_excel(output_file, index=False)
-        logging.info(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
-        print(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+        save_processed_results(pd.DataFrame(processed_data), output_base, incremental)
 
     except Exception as e:
         logging.error(f"파일 처리 중 오류 발생: {str(e)}")
@@ -0,0 +1,135 @@
+import json
+import logging
+import threading
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 리소스 유형별 차단 URL 패턴 (Network.setBlockedURLs는 URL 와일드카드만 지원하므로 확장자로 구분)
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'm3u8', 'ts', 'mp3', 'ogg', 'wav', 'mov'),
+    'stylesheet': ('css',),
+}
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+
+# 리소스 유형을 URL 패턴으로 변환 (쿼리 문자열이 붙은 URL 포함)
+def resource_type_patterns(resource_types):
+    patterns = []
+    for resource_type in resource_types:
+        if resource_type not in RESOURCE_TYPE_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 리소스 유형입니다: {resource_type}")
+        for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+            patterns += [f"*.{extension}", f"*.{extension}?*"]
+    return patterns
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# 브라우저 렌더링 프로필
+# - 지정한 리소스 유형과 URL 패턴을 CDP(Network.setBlockedURLs)로 차단
+# - 페이지 로드 전략(normal/eager/none)과 창 크기(썸네일 전용 모드는 축소) 설정
+# - 성능 로그에서 URL별 전송 바이트와 차단된 요청 수를 집계
+#   (성능 로그는 모든 네트워크 이벤트를 쌓으므로 차단 규칙이 있거나 measure_transfer일 때만 사용)
+class RenderProfile:
+    def __init__(self, name='full', block_resource_types=(), block_url_patterns=(),
+                 page_load_strategy='normal', window_size=(1920, 1080), measure_transfer=None):
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"지원하지 않는 페이지 로드 전략입니다: {page_load_strategy}")
+        self.name = name
+        self.block_resource_types = tuple(block_resource_types)
+        self.blocked_urls = resource_type_patterns(block_resource_types) + list(block_url_patterns)
+        self.page_load_strategy = page_load_strategy
+        self.window_size = tuple(window_size)
+        self.measure_transfer = bool(self.blocked_urls) if measure_transfer is None else measure_transfer
+
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.transfer_bytes = 0
+        self.blocked_requests = 0
+
+    # config.ini의 [RenderProfile.<이름>] 섹션에서 프로필 로드
+    @classmethod
+    def from_config(cls, config, name):
+        section = f"RenderProfile.{name}"
+        if not config.has_section(section):
+            raise ValueError(f"렌더링 프로필을 찾을 수 없습니다: {section}")
+        width, height = config.get(section, 'viewport', fallback='1920x1080').lower().split('x')
+        return cls(
+            name=name,
+            block_resource_types=_split_list(config.get(section, 'block_resource_types', fallback='')),
+            block_url_patterns=_split_list(config.get(section, 'block_url_patterns', fallback='')),
+            page_load_strategy=config.get(section, 'page_load_strategy', fallback='normal'),
+            window_size=(int(width), int(height)),
+            measure_transfer=config.getboolean(section, 'measure_transfer', fallback=None),
+        )
+
+    # Chrome 옵션에 페이지 로드 전략과 성능 로그(네트워크 이벤트) 설정
+    def apply_options(self, chrome_options):
+        chrome_options.page_load_strategy = self.page_load_strategy
+        if self.measure_transfer:
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return chrome_options
+
+    # 새 드라이버에 창 크기와 차단 URL 적용 (드라이버 세션 동안 유지)
+    def setup_driver(self, driver):
+        driver.set_window_size(*self.window_size)
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+
+    # 이전 페이지의 성능 로그 비우기 (driver.get 직전 호출)
+    def reset_transfer_log(self, driver):
+        if not self.measure_transfer:
+            return
+        try:
+            driver.get_log('performance')
+        except Exception as e:
+            logging.debug(f"성능 로그 초기화 실패: {str(e)}")
+
+    # 로드 전략이 none이면 driver.get이 바로 반환되므로 새 문서가 시작될 때까지 대기
+    def wait_for_navigation(self, driver, timeout):
+        if self.page_load_strategy != 'none':
+            return
+        WebDriverWait(driver, timeout).until(lambda d: d.execute_script(
+            "return location.protocol.indexOf('http') === 0 && document.readyState !== 'loading'"
+        ))
+
+    # 현재 페이지의 전송 바이트와 차단된 요청 수 집계 (측정하지 않으면 None)
+    def collect_transfer(self, driver):
+        if not self.measure_transfer:
+            return None, None
+        transfer_bytes = 0
+        blocked_requests = 0
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logging.debug(f"성능 로그 수집 실패: {str(e)}")
+            return None, None
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message['method'] == 'Network.loadingFinished':
+                transfer_bytes += int(message['params'].get('encodedDataLength', 0))
+            elif message['method'] == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+                blocked_requests += 1
+        with self._lock:
+            self.pages += 1
+            self.transfer_bytes += transfer_bytes
+            self.blocked_requests += blocked_requests
+        return transfer_bytes, blocked_requests
+
+    def log_stats(self):
+        with self._lock:
+            pages, transfer_bytes, blocked_requests = self.pages, self.transfer_bytes, self.blocked_requests
+        average_kb = transfer_bytes / pages / 1024 if pages else 0.0
+        average_blocked = blocked_requests / pages if pages else 0.0
+        message = (
+            f"렌더링 프로필 '{self.name}' 통계 - 페이지 {pages}개, 전송 {transfer_bytes / 1024 / 1024:.1f}MB "
+            f"(페이지당 {average_kb:.1f}KB), 차단된 요청 {blocked_requests}개 (페이지당 {average_blocked:.1f}개)"
+        )
+        logging.info(message)
+        print(message)
@@ -0,0 +1,137 @@
+import glob
+import json
+import os
+import time
+
+import pandas as pd
+
+# 처리 결과 파일 형식 (앞쪽이 우선: 같은 실행의 parquet와 xlsx가 모두 있으면 parquet 사용)
+RESULT_FORMATS = ('parquet', 'xlsx', 'jsonl', 'csv')
+
+# 실행 중 결과 파일 접미사 (처리 결과 파일 목록에서는 제외)
+LIVE_SUFFIX = '.live.jsonl'
+
+
+# 열 형식 저장을 위해 값 형식이 섞인 object 열을 문자열로 통일
+# (redirect_codes처럼 리스트와 문자열이 섞인 열은 JSON 문자열로 저장)
+def _to_text(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if value is None or pd.isna(value):
+        return None
+    return str(value)
+
+
+# 레코드 값을 직렬화 가능한 형태로 변환
+def to_serializable(record):
+    values = {}
+    for key, value in dict(record).items():
+        if isinstance(value, list):
+            value = json.dumps(value)
+        elif value is not None and not isinstance(value, str) and pd.isna(value):
+            value = None
+        elif hasattr(value, 'item'):
+            value = value.item()
+        values[key] = value
+    return values
+
+
+def to_columnar(df):
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].map(_to_text)
+    return df
+
+
+# 처리 결과 저장 - base_path에 확장자를 붙여 저장하고 경로 반환
+# export_xlsx이면 엑셀 파일도 함께 저장 (기존 엑셀 기반 도구용)
+def write_results(df, base_path, output_format='parquet', export_xlsx=False):
+    if output_format not in ('parquet', 'xlsx'):
+        raise ValueError(f"지원하지 않는 결과 형식입니다: {output_format}")
+    output_file = f"{base_path}.{output_format}"
+    if output_format == 'parquet':
+        to_columnar(df).to_parquet(output_file, index=False)
+        if export_xlsx:
+            df.to_excel(f"{base_path}.xlsx", index=False)
+    else:
+        df.to_excel(output_file, index=False)
+    return output_file
+
+
+# 처리 결과 로드 (parquet 파일 또는 part 파일 디렉토리, xlsx, jsonl, csv)
+def read_results(path, columns=None):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith('.jsonl'):
+        df = pd.read_json(path, lines=True, dtype=False)
+    elif path.endswith('.csv'):
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path)
+    return df[columns] if columns is not None else df
+
+
+# 처리 결과 파일 목록 (실행 시각 순, 같은 실행의 파일은 우선 형식 하나만)
+def find_result_files(directory='.', prefix='processed_data_'):
+    runs = {}
+    for output_format in reversed(RESULT_FORMATS):
+        for path in glob.glob(os.path.join(directory, f"{prefix}*.{output_format}")):
+            if not path.endswith(LIVE_SUFFIX):
+                runs[os.path.splitext(path)[0]] = path
+    return sorted(runs.values(), key=os.path.getmtime)
+
+
+def find_latest_result(directory='.', prefix='processed_data_'):
+    files = find_result_files(directory, prefix)
+    return files[-1] if files else None
+
+
+# ------------------------ 실행 중 결과 (live) ------------------------
+
+# 실행 중인 검사의 결과를 한 줄에 한 레코드씩 추가 기록 (대시보드가 뒤따라 읽음)
+# 레코드마다 바로 디스크로 내보내므로 다음 결과가 늦게 나와도 완료된 결과는 바로 보임
+# (읽는 쪽은 완성된 줄까지만 처리)
+class LiveResultWriter:
+    def __init__(self, base_path):
+        self.path = f"{base_path}{LIVE_SUFFIX}"
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(to_serializable(record), ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# live 파일에서 마지막으로 읽은 위치 이후의 새 레코드만 읽음
+class LiveResultReader:
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+
+    def read_new(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        # 아직 기록 중인 마지막 줄은 다음 조회에서 처리
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return [json.loads(line) for line in data[:end].decode('utf-8').splitlines() if line.strip()]
+
+
+# 진행 중인 실행의 live 파일 찾기
+# 최종 결과 파일이 이미 있거나 stale_seconds 동안 갱신이 없으면(중단된 실행) 제외
+def find_live_run(directory='.', prefix='processed_data_', stale_seconds=600):
+    live_files = sorted(glob.glob(os.path.join(directory, f"{prefix}*{LIVE_SUFFIX}")), key=os.path.getmtime)
+    if not live_files:
+        return None
+    latest = live_files[-1]
+    base_path = latest[:-len(LIVE_SUFFIX)]
+    if any(os.path.exists(f"{base_path}.{output_format}") for output_format in RESULT_FORMATS):
+        return None
+    if time.time() - os.path.getmtime(latest) > stale_seconds:
+        return None
+    return latest
@@ -0,0 +1,205 @@
+import bisect
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# 검색용 텍스트에서 id와 url 사이 구분자 (검색어에 나올 수 없는 바이트)
+SEPARATOR = '\x00'
+
+
+# 3바이트 n-gram을 24비트 정수로 변환 (text_ids: 각 바이트가 속한 텍스트 번호)
+def _trigram_codes(data, text_ids=None):
+    codes = (data[:-2].astype(np.int64) << 16) | (data[1:-1].astype(np.int64) << 8) | data[2:].astype(np.int64)
+    if text_ids is None:
+        return codes
+    # 텍스트 경계를 넘는 n-gram 제외
+    same_text = (text_ids[:-2] == text_ids[2:])
+    return codes[same_text], text_ids[:-2][same_text]
+
+
+# 텍스트 목록의 (3-gram 코드 << 32 | 텍스트 번호) 정렬 배열 (first_id부터 번호 부여)
+def _posting_pairs(texts, first_id=0):
+    encoded = [text.lower().encode('utf-8') for text in texts]
+    lengths = np.fromiter((len(text) for text in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    if len(data) < 3:
+        return np.empty(0, dtype=np.int64)
+    text_ids = np.repeat(np.arange(first_id, first_id + len(encoded), dtype=np.int64), lengths)
+    codes, owners = _trigram_codes(data, text_ids)
+    return np.unique((codes << 32) | owners)
+
+
+# 처리 결과 조회용 인덱스 (파일마다 한 번 생성하여 재사용, 실행 중 결과는 extend로 추가)
+# - 추가된 행은 청크 목록에 붙이기만 하고, 전체 테이블과 배열은 조회할 때 한 번만 합침
+#   (extend 비용은 추가된 행 수에만 비례)
+# - status: 상태별 고정 정수 코드 배열로 상태 필터를 정수 비교로 처리, 상태별 개수는 추가된 행만 집계
+# - (id, url) -> 행 번호 사전으로 선택한 행을 바로 조회
+# - id/url 부분 문자열 검색용 3-gram 역색인 (후보 행만 실제 문자열과 비교)
+class ResultIndex:
+    def __init__(self, data=None):
+        self._chunks = []
+        self._chunk_starts = []
+        self._data = None
+        self.row_count = 0
+
+        self.status_categories = []
+        self._status_code_of = {}
+        self._status_code_chunks = []
+        self.status_totals = Counter()
+        self.row_lookup = {}
+
+        self._text_chunks = []
+        self.text_lookup = {}
+        self._unique_ids = []
+        self._unique_urls = []
+        self._posting_runs = []
+
+        if data is not None:
+            self.extend(data)
+
+    def __len__(self):
+        return self.row_count
+
+    # 새 행 추가 (기존 행의 색인과 테이블은 다시 만들지 않음)
+    def extend(self, new_data):
+        new_data = new_data.reset_index(drop=True)
+        if new_data.empty:
+            return
+        offset = self.row_count
+        self._chunks.append(new_data)
+        self._chunk_starts.append(offset)
+        self._data = None
+        self.row_count += len(new_data)
+
+        # 처음 나온 상태에만 새 코드 부여 (기존 행의 코드는 바뀌지 않음, 값이 없으면 -1)
+        statuses = new_data['status'].tolist() if 'status' in new_data else [None] * len(new_data)
+        codes = np.empty(len(statuses), dtype=np.int64)
+        for i, status in enumerate(statuses):
+            if pd.isna(status):
+                codes[i] = -1
+                continue
+            code = self._status_code_of.get(status)
+            if code is None:
+                code = self._status_code_of[status] = len(self.status_categories)
+                self.status_categories.append(status)
+            codes[i] = code
+            self.status_totals[status] += 1
+        self._status_code_chunks.append(codes)
+
+        ids = new_data['id'].astype(str).tolist()
+        urls = new_data['url'].astype(str).tolist()
+        for position, key in enumerate(zip(ids, urls), start=offset):
+            self.row_lookup[key] = position
+
+        # 같은 id/url 조합은 한 번만 색인
+        first_id = len(self.text_lookup)
+        text_of_new_rows = np.empty(len(ids), dtype=np.int64)
+        new_ids, new_urls = [], []
+        for i, (row_id, url) in enumerate(zip(ids, urls)):
+            url = url.lower()
+            text_id = self.text_lookup.get((row_id, url))
+            if text_id is None:
+                text_id = self.text_lookup[(row_id, url)] = len(self.text_lookup)
+                new_ids.append(row_id)
+                new_urls.append(url)
+            text_of_new_rows[i] = text_id
+        self._text_chunks.append(text_of_new_rows)
+
+        if new_ids:
+            self._unique_ids += new_ids
+            self._unique_urls += new_urls
+            self._posting_runs.append(
+                _posting_pairs([f"{row_id}{SEPARATOR}{url}" for row_id, url in zip(new_ids, new_urls)], first_id))
+
+    # 청크 목록을 하나로 합쳐 캐시 (다음 extend 전까지 재사용)
+    @staticmethod
+    def _consolidate(chunks, combine):
+        if len(chunks) > 1:
+            chunks[:] = [combine(chunks)]
+        return chunks[0] if chunks else None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if not self._chunks:
+                return pd.DataFrame()
+            self._data = self._consolidate(self._chunks, lambda chunks: pd.concat(chunks, ignore_index=True))
+            self._chunk_starts = [0]
+        return self._data
+
+    @property
+    def status_codes(self):
+        codes = self._consolidate(self._status_code_chunks, np.concatenate)
+        return codes if codes is not None else np.empty(0, dtype=np.int64)
+
+    @property
+    def text_of_row(self):
+        texts = self._consolidate(self._text_chunks, np.concatenate)
+        return texts if texts is not None else np.empty(0, dtype=np.int64)
+
+    @property
+    def unique_ids(self):
+        return pd.Series(self._unique_ids, dtype=object)
+
+    @property
+    def unique_urls(self):
+        return pd.Series(self._unique_urls, dtype=object)
+
+    # 정렬된 posting 구간들을 검색할 때 한 번만 병합 (안정 정렬은 정렬된 구간을 선형 시간에 병합)
+    @property
+    def postings(self):
+        postings = self._consolidate(
+            self._posting_runs, lambda runs: np.sort(np.concatenate(runs), kind='stable'))
+        return postings if postings is not None else np.empty(0, dtype=np.int64)
+
+    # 검색어의 모든 3-gram을 포함하는 텍스트 번호 (후보)
+    def _candidate_texts(self, query):
+        query_bytes = np.frombuffer(query.lower().encode('utf-8'), dtype=np.uint8)
+        postings = self.postings
+        candidates = None
+        for code in np.unique(_trigram_codes(query_bytes)):
+            start, end = np.searchsorted(postings, [code << 32, (code + 1) << 32])
+            texts = postings[start:end] & 0xFFFFFFFF
+            candidates = texts if candidates is None else np.intersect1d(candidates, texts, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    # id(대소문자 구분) 또는 url(대소문자 무시)에 검색어가 포함된 행 마스크
+    def search_mask(self, query):
+        if len(query.encode('utf-8')) < 3:
+            texts = np.arange(len(self._unique_ids))
+        else:
+            texts = self._candidate_texts(query)
+        matched = (
+            self.unique_ids.iloc[texts].str.contains(query, regex=False).to_numpy()
+            | self.unique_urls.iloc[texts].str.contains(query.lower(), regex=False).to_numpy()
+        )
+        return np.isin(self.text_of_row, texts[matched])
+
+    # 선택한 상태의 행 마스크 (모든 상태를 선택하면 필터 없음, 아직 상태가 없는 행도 포함)
+    def status_mask(self, statuses):
+        selected = {self._status_code_of[status] for status in statuses if status in self._status_code_of}
+        if len(selected) == len(self.status_categories):
+            return np.ones(self.row_count, dtype=bool)
+        return np.isin(self.status_codes, list(selected))
+
+    # 상태 필터와 검색어를 함께 적용한 결과
+    def filter(self, statuses, query=''):
+        mask = self.status_mask(statuses)
+        if query:
+            mask &= self.search_mask(query)
+        return self.data[mask]
+
+    # 선택한 행 조회 (없으면 None, 행이 있는 청크에서 바로 조회)
+    def lookup(self, row_id, url):
+        position = self.row_lookup.get((str(row_id), str(url)))
+        if position is None:
+            return None
+        chunk_index = bisect.bisect_right(self._chunk_starts, position) - 1
+        return self._chunks[chunk_index].iloc[position - self._chunk_starts[chunk_index]]
+
+    # 상태별 개수 (행을 추가할 때마다 누적 집계한 값)
+    def status_counts(self):
+        return pd.DataFrame(self.status_totals.most_common(), columns=['status', 'count'])
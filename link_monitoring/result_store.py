@@ -0,0 +1,92 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+
+# URL 해시값을 키로 하는 결과 저장소 (SQLite)
+# - 마지막 상태, 로그, ETag/Last-Modified, 콘텐츠 지문, 스크린샷/썸네일 경로, dhash 저장
+# - 상태별 TTL 정책으로 재검사 필요 여부 판단
+class ResultStore:
+    COLUMNS = (
+        'url_hash', 'url', 'status', 'log', 'redirect_codes', 'etag', 'last_modified',
+        'content_fingerprint', 'screenshot', 'checked_at', 'validated_at',
+        'thumbnail', 'dhash', 'visible_text_length',
+    )
+    # 이전 버전 저장소에 없던 열 (열면서 추가)
+    ADDED_COLUMNS = {'thumbnail': 'TEXT', 'dhash': 'TEXT', 'visible_text_length': 'INTEGER'}
+
+    def __init__(self, db_path, ttl_policy=None, default_ttl=0):
+        self.db_path = db_path
+        self.ttl_policy = ttl_policy or {}
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT,
+                status TEXT,
+                log TEXT,
+                redirect_codes TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_fingerprint TEXT,
+                screenshot TEXT,
+                checked_at REAL,
+                validated_at REAL
+            )
+            """
+        )
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for column, column_type in self.ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {column} {column_type}")
+        self._conn.commit()
+
+    # 저장된 결과 조회
+    def get(self, url_hash):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM results WHERE url_hash = ?", (url_hash,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(self.COLUMNS, row))
+        record['redirect_codes'] = json.loads(record['redirect_codes']) if record['redirect_codes'] else "없음"
+        return record
+
+    # 전체 검사 결과 저장 (checked_at 갱신)
+    def put(self, url_hash, url, result, etag=None, last_modified=None):
+        now = time.time()
+        redirect_codes = result.get('redirect_codes')
+        redirect_codes = json.dumps(redirect_codes) if isinstance(redirect_codes, list) else None
+        visible_text_length = result.get('visible_text_length')
+        visible_text_length = int(visible_text_length) if visible_text_length is not None else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO results ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                (url_hash, url, result.get('status'), result.get('log'), redirect_codes, etag, last_modified,
+                 result.get('content_fingerprint'), result.get('screenshot'), now, now,
+                 result.get('thumbnail'), result.get('dhash'), visible_text_length)
+            )
+            self._conn.commit()
+
+    # 조건부 요청으로 변경 없음이 확인된 경우 검증 시간만 갱신
+    def touch(self, url_hash):
+        with self._lock:
+            self._conn.execute("UPDATE results SET validated_at = ? WHERE url_hash = ?", (time.time(), url_hash))
+            self._conn.commit()
+
+    # 상태별 TTL 이내인지 확인 (TTL 0은 매번 재검사)
+    def is_fresh(self, record):
+        ttl = self.ttl_policy.get(record['status'], self.default_ttl)
+        return ttl > 0 and time.time() - record['checked_at'] < ttl
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+        logging.info(f"결과 저장소 종료: {self.db_path}")
@@ -0,0 +1,147 @@
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+# 도메인별로 보관할 최근 소요 시간 표본 수
+HISTORY_SAMPLES = 200
+# 지표 파일에서 읽을 최근 줄 수 (파일은 실행마다 계속 커지므로 끝부분만 읽음)
+HISTORY_TAIL_LINES = 100000
+
+# 회로 상태
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+# 파일 끝에서부터 블록 단위로 읽어 마지막 max_lines줄 반환
+def tail_lines(path, max_lines, block_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0 and data.count(b'\n') <= max_lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    lines = data.splitlines()
+    # 처음부터 읽지 않았으면 첫 줄은 잘린 줄일 수 있으므로 제외
+    if position > 0:
+        lines = lines[1:]
+    return [line.decode('utf-8', errors='replace') for line in lines[-max_lines:]]
+
+
+# 지수 백오프 + 전체 지터 (0 ~ min(cap, base * 2^attempt) 사이 임의 값)
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# 도메인별 타임아웃 및 회로 차단 정책
+# - 과거 실행의 단계별 소요 시간(지표 파일)과 이번 실행의 측정값으로 도메인별 타임아웃 결정
+#   (관측된 백분위 x 배수, 최소값과 전역 설정값 사이로 제한)
+# - 일시적 오류가 연속으로 발생한 도메인은 일정 시간 동안 요청을 차단 (circuit breaker)
+class DomainPolicy:
+    def __init__(self, request_timeout=20, page_timeout=20, min_timeout=3.0, multiplier=3.0,
+                 latency_percentile=95, failure_threshold=5, cooldown=300.0):
+        self.request_timeout_max = request_timeout
+        self.page_timeout_max = page_timeout
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.latency_percentile = latency_percentile
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=HISTORY_SAMPLES))
+        self._failures = defaultdict(int)
+        self._open_until = {}
+        self.short_circuited = 0
+
+    # 과거 실행의 지표 파일(JSONL) 끝부분에서 도메인별 소요 시간 표본 로드
+    def load_history(self, metrics_file, max_lines=HISTORY_TAIL_LINES):
+        if not metrics_file or not os.path.exists(metrics_file):
+            return
+        loaded = 0
+        for line in tail_lines(metrics_file, max_lines):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.record_latency(entry.get('domain'), entry.get('spans', {}))
+            loaded += 1
+        logging.info(f"도메인별 소요 시간 이력 로드: {loaded}건")
+
+    # 단계별 소요 시간 기록 (probe: HTTP 요청, page_load + page_wait: 페이지 로딩)
+    def record_latency(self, domain, durations):
+        if not domain:
+            return
+        with self._lock:
+            if 'probe' in durations:
+                self._samples[(domain, 'request')].append(durations['probe'])
+            if 'page_load' in durations:
+                self._samples[(domain, 'page')].append(durations['page_load'] + durations.get('page_wait', 0.0))
+
+    def _timeout(self, domain, kind, maximum):
+        with self._lock:
+            samples = sorted(self._samples.get((domain, kind), ()))
+        if len(samples) < 5:
+            return maximum
+        rank = max(1, math.ceil(self.latency_percentile / 100 * len(samples)))
+        return min(maximum, max(self.min_timeout, samples[rank - 1] * self.multiplier))
+
+    def request_timeout(self, domain):
+        return self._timeout(domain, 'request', self.request_timeout_max)
+
+    def page_timeout(self, domain):
+        return self._timeout(domain, 'page', self.page_timeout_max)
+
+    # 성공 시 연속 실패 횟수 초기화 (반개방 상태에서 성공하면 회로 닫힘)
+    def record_success(self, domain):
+        with self._lock:
+            self._failures[domain] = 0
+            self._open_until.pop(domain, None)
+
+    # 일시적 오류 기록, 임계값에 도달하면 회로 개방
+    def record_failure(self, domain):
+        with self._lock:
+            self._failures[domain] += 1
+            if self._failures[domain] >= self.failure_threshold:
+                self._open_until[domain] = time.monotonic() + self.cooldown
+                logging.warning(f"{domain} 연속 {self._failures[domain]}회 실패로 {self.cooldown:.0f}초 동안 요청을 차단합니다.")
+
+    # 회로 상태 조회 (상태를 바꾸지 않음)
+    def state(self, domain):
+        with self._lock:
+            open_until = self._open_until.get(domain)
+        if open_until is None:
+            return CIRCUIT_CLOSED
+        return CIRCUIT_OPEN if time.monotonic() < open_until else CIRCUIT_HALF_OPEN
+
+    # 요청 전에 호출하여 요청 허용 여부 반환
+    # - 반개방 상태이면 한 요청만 시험 요청으로 허용하고 결과가 나올 때까지 다시 차단
+    #   (성공하면 회로 닫힘, 실패하면 다시 개방, 결과가 기록되지 않으면 대기 시간 후 다시 시험)
+    # - 차단된 요청 수는 short_circuited로 집계
+    def try_acquire_probe(self, domain):
+        with self._lock:
+            open_until = self._open_until.get(domain)
+            if open_until is None:
+                return True
+            now = time.monotonic()
+            if now >= open_until:
+                self._open_until[domain] = now + self.cooldown
+                self._failures[domain] = self.failure_threshold - 1
+                return True
+            self.short_circuited += 1
+            return False
+
+    def log_stats(self):
+        with self._lock:
+            open_domains = [domain for domain, until in self._open_until.items() if until > time.monotonic()]
+        message = f"도메인 정책 통계 - 차단으로 건너뛴 URL {self.short_circuited}개, 차단 중인 도메인 {len(open_domains)}개"
+        logging.info(message)
+        print(message)
@@ -0,0 +1,86 @@
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from image_index import compute_dhash
+
+# 지원하는 이미지 형식 (확장자: PIL 저장 형식)
+IMAGE_FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP'}
+
+
+# 브라우저 스레드와 분리된 스크린샷 인코딩 풀
+# - 메모리의 PNG 바이트를 받아 JPEG/WebP로 인코딩 (중간 PNG 파일 없음)
+# - 선택적으로 최대 너비로 축소하고 썸네일 생성
+# - 유사 이미지 묶음을 위한 차이 해시(dHash) 계산
+# - thumbnail_cache가 주어지면 저장한 파일 내용 기준으로 갤러리용 WebP 썸네일도 생성
+class ScreenshotEncoder:
+    def __init__(self, workers=4, image_format='jpg', quality=85, max_width=0, thumbnail_width=0,
+                 thumbnail_cache=None):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식입니다: {image_format}")
+        self.workers = workers
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.thumbnail_width = thumbnail_width
+        self.thumbnail_cache = thumbnail_cache
+        self._executor = None
+
+    # 인코딩 결과 경로 (인코딩 전에 결과 행에 기록할 수 있도록 미리 결정)
+    def paths(self, base_path):
+        paths = {'screenshot': f"{base_path}.{self.image_format}", 'thumbnail': None, 'dhash': None}
+        if self.thumbnail_width:
+            paths['thumbnail'] = f"{base_path}_thumb.{self.image_format}"
+        return paths
+
+    # 메모리에서 인코딩한 뒤 파일로 저장하고 인코딩된 바이트 반환
+    def _save(self, image, path):
+        buffer = io.BytesIO()
+        image.save(buffer, IMAGE_FORMATS[self.image_format], quality=self.quality)
+        data = buffer.getvalue()
+        with open(path, 'wb') as f:
+            f.write(data)
+        return data
+
+    def _encode(self, png_bytes, base_path):
+        start_time = time.perf_counter()
+        paths = self.paths(base_path)
+        with Image.open(io.BytesIO(png_bytes)) as img:
+            image = img.convert('RGB')
+        paths['dhash'] = compute_dhash(image)
+
+        # 최대 너비보다 크면 비율을 유지하여 축소
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        data = self._save(image, paths['screenshot'])
+        if self.thumbnail_cache is not None:
+            # 갤러리 썸네일은 조회 시 다시 만들 수 있으므로 실패해도 스크린샷은 유지
+            try:
+                self.thumbnail_cache.store(image, self.thumbnail_cache.key_for_bytes(data))
+            except Exception as e:
+                logging.warning(f"갤러리 썸네일 저장 실패: {paths['screenshot']} - {str(e)}")
+
+        if paths['thumbnail']:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((self.thumbnail_width, self.thumbnail_width * image.height // image.width))
+            self._save(thumbnail, paths['thumbnail'])
+
+        paths['encode_time'] = time.perf_counter() - start_time
+        logging.info(f"스크린샷 인코딩 완료: {paths['screenshot']}")
+        return paths
+
+    # 인코딩 작업 제출 (Future 반환)
+    def submit(self, png_bytes, base_path):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='screenshot-encoder')
+        return self._executor.submit(self._encode, png_bytes, base_path)
+
+    # 남은 인코딩 작업 완료 대기 후 종료
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
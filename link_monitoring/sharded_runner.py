@@ -0,0 +1,221 @@
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+from datetime import datetime
+
+import pandas as pd
+
+from process_data import (
+    config, canonicalize_url, generate_hash, save_processed_results, set_screenshot_dir, setup_directories,
+    time_logger,
+)
+from streaming import check_links_streaming, iter_input_chunks
+
+# 샤드 실행 설정
+SHARD_COUNT = config.getint('Settings', 'shard_count', fallback=8)
+SHARD_WORKERS = config.getint('Settings', 'shard_workers', fallback=2)
+SHARD_WORK_DIR = config.get('Settings', 'shard_work_dir', fallback='shards')
+# 작업 디렉토리 아래 스크린샷 디렉토리 (모든 호스트의 작업자가 공유)
+SHARD_SCREENSHOT_DIR = 'screenshots'
+# 결과에 스크린샷 경로가 기록되는 열
+SCREENSHOT_COLUMNS = ('screenshot', 'thumbnail')
+
+
+# 샤드 파일 경로
+def shard_path(work_dir, shard_index, kind):
+    return os.path.join(work_dir, f"shard-{shard_index:04d}.{kind}")
+
+
+# URL 해시값으로 샤드 번호 결정 (같은 URL은 항상 같은 샤드에 배정)
+def shard_of(url, num_shards):
+    return int(generate_hash(canonicalize_url(url)), 16) % num_shards
+
+
+# 입력 파일을 URL 해시 기준으로 샤드별 JSONL 파일로 분할
+def partition_input(input_file, work_dir=SHARD_WORK_DIR, num_shards=SHARD_COUNT):
+    os.makedirs(work_dir, exist_ok=True)
+    for stale_file in glob.glob(os.path.join(work_dir, "shard-*")):
+        os.remove(stale_file)
+
+    shard_rows = [0] * num_shards
+    for chunk in iter_input_chunks(input_file):
+        shard_ids = chunk['url'].map(lambda url: shard_of(url, num_shards))
+        for shard_index, shard_chunk in chunk.groupby(shard_ids):
+            with open(shard_path(work_dir, shard_index, 'input.jsonl'), 'a', encoding='utf-8') as f:
+                shard_chunk.to_json(f, orient='records', lines=True, force_ascii=False)
+            shard_rows[shard_index] += len(shard_chunk)
+
+    logging.info(f"입력 분할 완료: {num_shards}개 샤드, 샤드별 행 수 {shard_rows}")
+    return [index for index, rows in enumerate(shard_rows) if rows > 0]
+
+
+# 샤드 작업 선점 (공유 디렉토리에서 원자적으로 claim 파일 생성)
+def claim_shard(work_dir, shard_index):
+    if os.path.exists(shard_path(work_dir, shard_index, 'done')):
+        return False
+    try:
+        fd = os.open(shard_path(work_dir, shard_index, 'claim'), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"{socket.gethostname()}:{os.getpid()}\n")
+    return True
+
+
+# 샤드 작업자: 남은 샤드를 하나씩 선점하여 처리
+# 다른 호스트에서도 같은 공유 디렉토리를 지정하여 실행 가능 (스크린샷도 공유 디렉토리 아래에 저장)
+# 작업자가 비정상 종료되어 claim 파일이 남은 경우 파일을 지우고 다시 실행하면 체크포인트부터 이어서 처리
+def run_shard_worker(work_dir=SHARD_WORK_DIR, incremental=False):
+    set_screenshot_dir(os.path.join(work_dir, SHARD_SCREENSHOT_DIR))
+    processed_shards = 0
+    for input_path in sorted(glob.glob(os.path.join(work_dir, "shard-*.input.jsonl"))):
+        shard_index = int(os.path.basename(input_path).split('.')[0].split('-')[1])
+        if not claim_shard(work_dir, shard_index):
+            continue
+
+        logging.info(f"샤드 {shard_index} 처리 시작 (pid {os.getpid()})")
+        try:
+            check_links_streaming(
+                input_file=input_path,
+                output_file=shard_path(work_dir, shard_index, 'result.jsonl'),
+                output_format='jsonl',
+                incremental=incremental,
+                prepare_directories=False,
+            )
+            open(shard_path(work_dir, shard_index, 'done'), 'w').close()
+            processed_shards += 1
+        except Exception:
+            logging.error(f"샤드 {shard_index} 처리 실패 (pid {os.getpid()})", exc_info=True)
+            raise
+        finally:
+            os.remove(shard_path(work_dir, shard_index, 'claim'))
+    return processed_shards
+
+
+# 작업자 호스트 기준으로 기록된 스크린샷 경로를 병합하는 쪽의 공유 디렉토리 경로로 변경
+# (작업자마다 작업 디렉토리의 마운트 위치나 상대 경로가 다를 수 있으므로 파일 이름만 유지)
+def rewrite_screenshot_paths(df, work_dir):
+    screenshot_dir = os.path.join(work_dir, SHARD_SCREENSHOT_DIR)
+    for column in SCREENSHOT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(
+                lambda path: os.path.join(screenshot_dir, os.path.basename(path.replace('\\', '/')))
+                if isinstance(path, str) and path else path
+            )
+    return df
+
+
+# 샤드 결과를 하나의 processed_data_* 파일로 병합 (output_base는 확장자 제외 경로)
+# 단일 실행과 같은 마무리 처리(유사 스크린샷 분류, 이력 저장소 추가)를 거침
+def merge_shard_results(work_dir=SHARD_WORK_DIR, output_base=None, incremental=False):
+    if output_base is None:
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_base = f"processed_data_{current_time}"
+
+    pending = [
+        path for path in glob.glob(os.path.join(work_dir, "shard-*.input.jsonl"))
+        if not os.path.exists(path.replace('.input.jsonl', '.done'))
+    ]
+    if pending:
+        logging.warning(f"완료되지 않은 샤드 {len(pending)}개가 있습니다: {pending}")
+
+    result_paths = sorted(glob.glob(os.path.join(work_dir, "shard-*.result.jsonl")))
+    frames = [pd.read_json(path, lines=True, dtype=False) for path in result_paths if os.path.getsize(path) > 0]
+    merged_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return save_processed_results(rewrite_screenshot_paths(merged_df, work_dir), output_base, incremental)
+
+
+# 비정상 종료된 작업자 프로세스가 남긴 claim 파일 제거 (다른 작업자가 다시 선점할 수 있도록)
+def release_claims(work_dir, pids):
+    owners = {f"{socket.gethostname()}:{pid}" for pid in pids}
+    released = []
+    for claim_path in glob.glob(os.path.join(work_dir, "shard-*.claim")):
+        with open(claim_path, encoding='utf-8') as f:
+            owner = f.read().strip()
+        if owner in owners:
+            os.remove(claim_path)
+            released.append(int(os.path.basename(claim_path).split('.')[0].split('-')[1]))
+    return sorted(released)
+
+
+# 완료되지 않았고 다른 작업자가 처리 중이지도 않은 샤드 번호
+def unfinished_shards(work_dir, shards):
+    return [
+        shard_index for shard_index in shards
+        if not os.path.exists(shard_path(work_dir, shard_index, 'done'))
+        and not os.path.exists(shard_path(work_dir, shard_index, 'claim'))
+    ]
+
+
+# 작업자 프로세스 N개를 실행하고 비정상 종료된 작업자의 claim 파일 정리
+# 반환값: 비정상 종료된 작업자 수
+def run_shard_workers(work_dir, num_workers, incremental):
+    workers = [
+        multiprocessing.Process(target=run_shard_worker, args=(work_dir, incremental))
+        for _ in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    failed = [worker for worker in workers if worker.exitcode != 0]
+    if failed:
+        released = release_claims(work_dir, [worker.pid for worker in failed])
+        for worker in failed:
+            logging.error(f"샤드 작업자 비정상 종료: pid {worker.pid}, 종료 코드 {worker.exitcode}")
+        if released:
+            logging.error(f"비정상 종료된 작업자가 선점한 샤드 {released}를 다시 처리 대상으로 되돌립니다.")
+    return len(failed)
+
+
+# 샤드 실행 메인 함수 - 입력 분할 후 작업자 프로세스 N개로 처리하고 결과 병합
+# 작업자가 비정상 종료되면 남은 샤드를 한 번 더 처리하고, 그래도 남으면 병합하지 않고 실패 처리
+@time_logger
+def check_links_sharded(input_file="test_data.xlsx", num_shards=SHARD_COUNT, num_workers=SHARD_WORKERS,
+                        work_dir=SHARD_WORK_DIR, incremental=False):
+    setup_directories(clear_screenshots=not incremental)
+    shard_screenshot_dir = os.path.join(work_dir, SHARD_SCREENSHOT_DIR)
+    if not incremental and os.path.exists(shard_screenshot_dir):
+        shutil.rmtree(shard_screenshot_dir)
+    shards = partition_input(input_file, work_dir, num_shards)
+    print(f"입력을 {len(shards)}개 샤드로 분할했습니다. 작업자 {num_workers}개로 처리합니다.")
+
+    # 각 작업자 프로세스는 자체 드라이버 풀을 사용
+    if run_shard_workers(work_dir, min(num_workers, len(shards)), incremental):
+        remaining = unfinished_shards(work_dir, shards)
+        if remaining:
+            logging.warning(f"완료되지 않은 샤드 {remaining}를 다시 처리합니다.")
+            run_shard_workers(work_dir, min(num_workers, len(remaining)), incremental)
+
+    remaining = unfinished_shards(work_dir, shards)
+    if remaining:
+        message = f"샤드 {remaining} 처리에 실패하여 결과를 병합하지 않습니다. (작업 디렉토리: {work_dir})"
+        logging.error(message)
+        raise RuntimeError(message)
+
+    return merge_shard_results(work_dir, incremental=incremental)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="URL 해시 기준 샤드 실행")
+    parser.add_argument('command', choices=['run', 'partition', 'worker', 'merge'])
+    parser.add_argument('--input', default="test_data_20241028.xlsx")
+    parser.add_argument('--work-dir', default=SHARD_WORK_DIR)
+    parser.add_argument('--shards', type=int, default=SHARD_COUNT)
+    parser.add_argument('--workers', type=int, default=SHARD_WORKERS)
+    parser.add_argument('--incremental', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        check_links_sharded(args.input, args.shards, args.workers, args.work_dir, args.incremental)
+    elif args.command == 'partition':
+        partition_input(args.input, args.work_dir, args.shards)
+    elif args.command == 'worker':
+        run_shard_worker(args.work_dir, args.incremental)
+    else:
+        merge_shard_results(args.work_dir, incremental=args.incremental)
@@ -0,0 +1,129 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# 요약 통계를 계산할 백분위
+PERCENTILES = (50, 95, 99)
+
+# process_data가 기록하는 처리 단계 (결과 열 이름은 <단계>_time)
+STAGE_NAMES = (
+    'probe', 'driver_acquire', 'page_load', 'page_wait',
+    'content_analysis', 'screenshot_capture', 'screenshot_encode',
+)
+SPAN_FIELDS = tuple(f"{stage}_time" for stage in STAGE_NAMES)
+
+
+# URL 하나를 처리하는 동안의 단계별 소요 시간 기록
+class StageSpans:
+    def __init__(self):
+        self.durations = {}
+
+    # 단계 실행 시간을 측정 (같은 단계가 여러 번 실행되면 합산)
+    @contextmanager
+    def span(self, stage):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start_time)
+
+    def add(self, stage, seconds):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    # 결과 행에 단계별 소요 시간 열 기록 (예: page_load_time)
+    def apply(self, result):
+        for stage, seconds in self.durations.items():
+            result[f"{stage}_time"] = round(seconds, 3)
+
+
+# 백분위 계산 (가장 가까운 순위 방식)
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# 실행 전체의 단계별 소요 시간 수집 및 요약
+# - URL마다 JSONL 한 줄 기록
+# - 실행 종료 시 단계별, 도메인별 p50/p95/p99 요약을 로그와 Prometheus 텍스트 형식 파일로 출력
+class StageMetrics:
+    def __init__(self, metrics_file=None):
+        self.metrics_file = metrics_file
+        self._lock = threading.Lock()
+        self._stage_values = defaultdict(list)
+        self._domain_values = defaultdict(list)
+        self._file = open(metrics_file, 'a', encoding='utf-8') if metrics_file else None
+
+    def record(self, url, domain, status, durations):
+        with self._lock:
+            for stage, seconds in durations.items():
+                self._stage_values[stage].append(seconds)
+                self._domain_values[(domain, stage)].append(seconds)
+            if self._file:
+                self._file.write(json.dumps({
+                    'url': url, 'domain': domain, 'status': status,
+                    'spans': {stage: round(seconds, 4) for stage, seconds in durations.items()},
+                }, ensure_ascii=False) + '\n')
+
+    def _summarize(self, values_by_key):
+        summary = {}
+        for key, values in values_by_key.items():
+            values = sorted(values)
+            summary[key] = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+            summary[key]['count'] = len(values)
+            summary[key]['sum'] = sum(values)
+        return summary
+
+    def summary(self):
+        with self._lock:
+            return self._summarize(self._stage_values), self._summarize(self._domain_values)
+
+    # Prometheus 텍스트 형식으로 변환
+    def to_prometheus(self):
+        stage_summary, domain_summary = self.summary()
+        lines = [
+            "# HELP link_check_stage_seconds 링크 검사 단계별 소요 시간",
+            "# TYPE link_check_stage_seconds summary",
+        ]
+        for stage, stats in sorted(stage_summary.items()):
+            for pct in PERCENTILES:
+                lines.append(f'link_check_stage_seconds{{stage="{stage}",quantile="{pct / 100}"}} {stats[f"p{pct}"]:.6f}')
+            lines.append(f'link_check_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+            lines.append(f'link_check_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += [
+            "# HELP link_check_domain_stage_seconds 도메인별 링크 검사 단계 소요 시간",
+            "# TYPE link_check_domain_stage_seconds summary",
+        ]
+        for (domain, stage), stats in sorted(domain_summary.items()):
+            labels = f'domain="{domain}",stage="{stage}"'
+            for pct in PERCENTILES:
+                lines.append(f'link_check_domain_stage_seconds{{{labels},quantile="{pct / 100}"}} {stats[f"p{pct}"]:.6f}')
+            lines.append(f'link_check_domain_stage_seconds_sum{{{labels}}} {stats["sum"]:.6f}')
+            lines.append(f'link_check_domain_stage_seconds_count{{{labels}}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    # 요약 출력 및 Prometheus 파일 저장
+    def write_summary(self, prometheus_file=None):
+        stage_summary, _ = self.summary()
+        for stage, stats in sorted(stage_summary.items()):
+            message = (
+                f"단계 {stage}: {stats['count']}회, p50 {stats['p50']:.3f}초, "
+                f"p95 {stats['p95']:.3f}초, p99 {stats['p99']:.3f}초"
+            )
+            logging.info(message)
+            print(message)
+        if prometheus_file:
+            with open(prometheus_file, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            logging.info(f"단계별 지표가 {prometheus_file} 파일로 저장되었습니다.")
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,261 @@
+import csv
+import itertools
+import json
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from process_data import (
+    config, create_driver_pool, render_profile, iter_link_results, setup_directories, time_logger,
+    ResultStore, StageMetrics, RESULT_STORE_PATH, RESULT_TTL_POLICY,
+    METRICS_FILE, METRICS_PROMETHEUS_FILE, CHECK_RESULT_FIELDS, NUMERIC_RESULT_FIELDS, SPAN_FIELDS,
+)
+from result_files import to_columnar, to_serializable
+
+# 스트리밍 처리 설정
+STREAM_CHUNK_SIZE = config.getint('Settings', 'stream_chunk_size', fallback=1000)
+STREAM_OUTPUT_FORMAT = config.get('Settings', 'stream_output_format', fallback='jsonl')
+
+
+# ------------------------ 입력 읽기 ------------------------
+
+# 입력 파일을 chunk_size 행 단위의 DataFrame으로 읽음 (xlsx, csv, jsonl, parquet)
+def iter_input_chunks(input_file, chunk_size=STREAM_CHUNK_SIZE):
+    extension = os.path.splitext(input_file)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(input_file, chunksize=chunk_size)
+    elif extension == '.jsonl':
+        yield from pd.read_json(input_file, lines=True, chunksize=chunk_size, dtype=False)
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(input_file)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+        workbook = load_workbook(input_file, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            chunk = []
+            for values in rows:
+                chunk.append(values)
+                if len(chunk) >= chunk_size:
+                    yield pd.DataFrame(chunk, columns=header)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"지원하지 않는 입력 형식입니다: {input_file}")
+
+
+# ------------------------ 결과 저장 (append-only) ------------------------
+
+# 결과 파일의 고정 열 목록 (입력 열 + 검사 결과 열 + 단계별 소요 시간 열)
+# 모든 레코드를 같은 열로 맞추므로 첫 레코드에 없던 열도 빠지지 않음
+def result_columns(input_columns):
+    columns = [str(column) for column in input_columns]
+    return columns + [field for field in CHECK_RESULT_FIELDS + SPAN_FIELDS if field not in columns]
+
+
+# 레코드를 고정 열 순서로 맞춤 (없는 열은 None, 목록에 없는 열은 제외)
+def conform_record(record, columns):
+    values = to_serializable(record)
+    return {column: values.get(column) for column in columns}
+
+
+# JSONL 결과 파일 (한 줄에 한 레코드)
+class JsonlSink:
+    newline = None
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self._file = open(path, 'a', encoding='utf-8', newline=self.newline)
+
+    def write(self, record):
+        self._file.write(json.dumps(conform_record(record, self.columns), ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    # 체크포인트용 현재 위치 반환
+    def commit(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    # 마지막 체크포인트 이후 기록된 내용 제거
+    def truncate(self, offset):
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def close(self):
+        self._file.close()
+
+
+# CSV 결과 파일 (고정 열 목록으로 헤더 작성)
+# - csv 모듈이 줄바꿈을 직접 쓰므로 newline='' 으로 열어 Windows에서 \r\r\n 이 생기지 않도록 함
+class CsvSink(JsonlSink):
+    newline = ''
+
+    def __init__(self, path, columns):
+        super().__init__(path, columns)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+
+    def write(self, record):
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+        self._writer.writerow(conform_record(record, self.columns))
+        self._file.flush()
+
+
+# Parquet 결과 디렉토리 (청크마다 row group 하나짜리 part 파일 작성)
+# 모든 part 파일이 같은 스키마가 되도록 숫자 열은 float64, 나머지 열은 문자열로 고정
+class ParquetSink:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        self.path = path
+        self.columns = columns
+        self.schema = pa.schema([
+            (column, pa.float64() if column in NUMERIC_RESULT_FIELDS else pa.string()) for column in columns
+        ])
+        self._records = []
+        os.makedirs(path, exist_ok=True)
+
+    def _parts(self):
+        return sorted(name for name in os.listdir(self.path) if name.endswith('.parquet'))
+
+    def write(self, record):
+        self._records.append(to_serializable(record))
+
+    def commit(self):
+        if self._records:
+            part_path = os.path.join(self.path, f"part-{len(self._parts()):05d}.parquet")
+            df = pd.DataFrame(self._records).reindex(columns=self.columns)
+            for column in self.columns:
+                if column in NUMERIC_RESULT_FIELDS:
+                    df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+                else:
+                    df[column] = df[column].astype(object)
+            to_columnar(df).to_parquet(part_path, index=False, schema=self.schema)
+            self._records = []
+        return len(self._parts())
+
+    # 체크포인트 이후 작성된 part 파일 제거
+    def truncate(self, offset):
+        for name in self._parts()[offset:]:
+            os.remove(os.path.join(self.path, name))
+        self._records = []
+
+    def close(self):
+        self._records = []
+
+
+SINK_TYPES = {'jsonl': JsonlSink, 'csv': CsvSink, 'parquet': ParquetSink}
+
+
+# ------------------------ 체크포인트 ------------------------
+
+def load_checkpoint(checkpoint_path, input_file):
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('input_file') != os.path.abspath(input_file):
+        logging.warning(f"체크포인트의 입력 파일이 다릅니다. 처음부터 다시 처리합니다: {checkpoint_path}")
+        return None
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    temp_path = checkpoint_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(temp_path, checkpoint_path)
+
+
+# ------------------------ 메인 처리 ------------------------
+
+# 스트리밍 처리 함수
+# - 이어서 처리하려면 중단된 실행과 같은 output_file을 지정
+# - 입력을 청크 단위로 읽어 메모리 사용량을 일정하게 유지
+# - 결과는 완료되는 즉시 append-only 파일에 기록
+# - 청크가 끝날 때마다 체크포인트를 저장하여 중단된 실행을 이어서 처리
+@time_logger
+def check_links_streaming(input_file="test_data.xlsx", output_file=None, output_format=STREAM_OUTPUT_FORMAT,
+                          chunk_size=STREAM_CHUNK_SIZE, incremental=False, resume=True, prepare_directories=True):
+    if output_format not in SINK_TYPES:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format}")
+    if output_file is None:
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = f"processed_data_{current_time}.{output_format}"
+    checkpoint_path = output_file + '.checkpoint.json'
+
+    checkpoint = load_checkpoint(checkpoint_path, input_file) if resume else None
+    if checkpoint is None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    chunks_done = checkpoint['chunks_done'] if checkpoint else 0
+    rows_done = checkpoint['rows_done'] if checkpoint else 0
+
+    # 이어서 처리할 때는 기존 스크린샷을 유지
+    # (여러 프로세스가 같은 디렉토리를 쓰는 경우 prepare_directories=False로 호출)
+    if prepare_directories:
+        setup_directories(clear_screenshots=not (incremental or checkpoint))
+    result_store = ResultStore(RESULT_STORE_PATH, RESULT_TTL_POLICY) if incremental else None
+    metrics = StageMetrics(METRICS_FILE)
+
+    # 첫 청크의 입력 열로 결과 파일의 고정 열 목록을 정함
+    chunks = iter_input_chunks(input_file, chunk_size)
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        logging.warning(f"입력 파일에 처리할 행이 없습니다: {input_file}")
+        return None
+    chunks = itertools.chain([first_chunk], chunks)
+    sink = SINK_TYPES[output_format](output_file, result_columns(first_chunk.columns))
+    if checkpoint:
+        sink.truncate(checkpoint['offset'])
+        logging.info(f"체크포인트에서 재시작: 청크 {chunks_done}개, {rows_done}행 처리 완료")
+        print(f"체크포인트에서 재시작: 청크 {chunks_done}개, {rows_done}행 처리 완료")
+    else:
+        sink.truncate(0)
+
+    try:
+        with create_driver_pool() as driver_pool:
+            for chunk_index, chunk in enumerate(chunks):
+                if chunk_index < chunks_done:
+                    continue
+                for record in iter_link_results(chunk, driver_pool, result_store, metrics):
+                    sink.write(record)
+
+                rows_done += len(chunk)
+                chunks_done = chunk_index + 1
+                save_checkpoint(checkpoint_path, {
+                    'input_file': os.path.abspath(input_file),
+                    'chunks_done': chunks_done,
+                    'rows_done': rows_done,
+                    'offset': sink.commit(),
+                })
+                logging.info(f"청크 {chunks_done} 완료 (누적 {rows_done}행)")
+            driver_pool.log_stats()
+        render_profile.log_stats()
+        metrics.write_summary(METRICS_PROMETHEUS_FILE)
+    finally:
+        sink.close()
+        metrics.close()
+        if result_store is not None:
+            result_store.close()
+
+    # 정상 종료 시 체크포인트 제거
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    logging.info(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+    print(f"처리된 데이터가 {output_file} 파일로 저장되었습니다.")
+    return output_file
+
+if __name__ == "__main__":
+    check_links_streaming(input_file="test_data_20241028.xlsx")
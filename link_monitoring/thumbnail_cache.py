@@ -0,0 +1,80 @@
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+
+from PIL import Image
+
+# 갤러리용 썸네일 기본 너비
+DEFAULT_THUMBNAIL_WIDTH = 320
+
+
+# 이미지 파일 내용의 해시 (같은 내용의 스크린샷은 같은 썸네일 공유)
+# 경로, 수정 시각, 크기가 같으면 파일을 다시 읽지 않음
+@functools.lru_cache(maxsize=65536)
+def _content_key(path, mtime, size):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_key(image_path):
+    stat = os.stat(image_path)
+    return _content_key(os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+
+
+# 내용 해시 기준 WebP 썸네일 캐시
+# - 캐시 경로: <cache_dir>/<해시 앞 2자리>/<해시>_<너비>.webp
+# - 캡처 시점(store)이나 처음 조회할 때(get) 생성
+# - 임시 파일에 쓴 뒤 이름을 바꾸므로 여러 프로세스가 동시에 만들어도 안전
+class ThumbnailCache:
+    def __init__(self, cache_dir='thumbnail_cache', width=DEFAULT_THUMBNAIL_WIDTH, quality=75):
+        self.cache_dir = cache_dir
+        self.width = width
+        self.quality = quality
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}_{self.width}.webp")
+
+    # 이미 디코딩된 이미지로 썸네일 저장 (key는 원본 파일 내용의 sha1)
+    def store(self, image, key):
+        thumbnail_path = self.path_for(key)
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+        thumbnail = image.copy()
+        thumbnail.thumbnail((self.width, max(1, self.width * image.height // image.width)))
+        if thumbnail.mode not in ('RGB', 'RGBA'):
+            thumbnail = thumbnail.convert('RGB')
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        # 호출마다 고유한 임시 파일 (같은 내용을 여러 스레드가 동시에 저장해도 충돌하지 않음)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(thumbnail_path), suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            thumbnail.save(f, 'WEBP', quality=self.quality)
+        try:
+            os.replace(temp_path, thumbnail_path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+        return thumbnail_path
+
+    # 원본 이미지 경로로 썸네일 조회 (없으면 생성, 원본을 읽을 수 없으면 None)
+    def get(self, image_path):
+        try:
+            thumbnail_path = self.path_for(content_key(image_path))
+            if os.path.exists(thumbnail_path):
+                return thumbnail_path
+            with Image.open(image_path) as image:
+                # JPEG는 디코딩 시 축소하여 전체 해상도로 풀지 않음
+                image.draft('RGB', (self.width, self.width))
+                return self.store(image, content_key(image_path))
+        except (OSError, ValueError) as e:
+            logging.warning(f"썸네일 생성 실패: {image_path} - {str(e)}")
+            return None
+
+    # 인코딩된 원본 바이트로 캐시 키 계산
+    @staticmethod
+    def key_for_bytes(data):
+        return hashlib.sha1(data).hexdigest()
@@ -4,24 +4,62 @@ import pandas as pd
 from PIL import Image, UnidentifiedImageError
 import streamlit as st
 import plotly.graph_objects as go
-import glob
 import os
+import math
+import time
+import configparser
+from result_files import find_latest_result, find_live_run, read_results, LiveResultReader
+from thumbnail_cache import ThumbnailCache
+from result_index import ResultIndex
+from history_store import HistoryStore
 
 # 페이지 레이아웃 설정
 st.set_page_config(layout="wide")
 
-# 최신 엑셀 파일 찾기 함수
-def get_latest_file(directory, extension="xlsx"):
-    files = glob.glob(os.path.join(directory, f"processed_data*.{extension}"))
-    if not files:
-        return None
-    latest_file = max(files, key=os.path.getmtime)
-    return latest_file
+# 갤러리 설정 (config.ini)
+config = configparser.ConfigParser()
+config.read('config.ini')
+GALLERY_PAGE_SIZE = config.getint('Settings', 'gallery_page_size', fallback=12)
+thumbnail_cache = ThumbnailCache(
+    config.get('Settings', 'thumbnail_cache_dir', fallback='thumbnail_cache'),
+    config.getint('Settings', 'gallery_thumbnail_width', fallback=320)
+)
+
+# 실행 중 결과 갱신 주기 및 중단된 실행으로 판단하는 시간 (초)
+LIVE_REFRESH_SECONDS = config.getfloat('Settings', 'live_refresh_seconds', fallback=5)
+LIVE_STALE_SECONDS = config.getfloat('Settings', 'live_stale_seconds', fallback=600)
+history_store = HistoryStore(config.get('Settings', 'history_dir', fallback='history'))
+
+# 처리 결과 파일 로드 및 조회용 인덱스 생성 (파일마다 한 번만 생성하여 재실행 간 공유)
+# parquet 우선, 이전 실행의 xlsx도 지원
+@st.cache_resource
+def load_index(file_path):
+    return ResultIndex(read_results(file_path))
+
+# 실행 중인 검사의 live 파일에서 새로 추가된 행만 읽어 인덱스에 추가
+# (세션마다 읽은 위치와 인덱스를 유지하므로 전체를 다시 읽지 않음)
+def load_live_index(live_path):
+    live_run = st.session_state.get('live_run')
+    if live_run is None or live_run['path'] != live_path:
+        live_run = {'path': live_path, 'reader': LiveResultReader(live_path), 'index': ResultIndex()}
+        st.session_state['live_run'] = live_run
+    new_records = live_run['reader'].read_new()
+    if new_records:
+        live_run['index'].extend(pd.DataFrame(new_records))
+    return live_run['index']
+
+# 변경 보고서 로드 (파일이 갱신되면 다시 로드)
+# change_detection은 process_data를 가져오므로 접두사만 같은 값으로 사용
+CHANGE_REPORT_PREFIX = 'change_report_'
 
-# 엑셀 파일 로드
 @st.cache_data
-def load_data(file_path):
-    return pd.read_excel(file_path)
+def load_change_report(file_path, mtime):
+    return read_results(file_path)
+
+# 일별 집계 로드 (집계 파일이 갱신되면 다시 로드)
+@st.cache_data
+def load_history_trends(daily_mtime):
+    return history_store.status_trend(), history_store.uptime_trend()
 
 # Google Material Design 적용을 위한 HTML/CSS 템플릿
 material_css = """
@@ -83,34 +121,44 @@ material_css = """
 """
 st.markdown(material_css, unsafe_allow_html=True)
 
-# 최신 엑셀 파일 경로 찾기
-latest_file_path = get_latest_file('.', 'xlsx')
+# 진행 중인 검사가 있으면 live 파일을, 없으면 최신 처리 결과 파일을 사용
+live_path = find_live_run('.', stale_seconds=LIVE_STALE_SECONDS)
+latest_file_path = live_path or find_latest_result('.')
 
 # 파일이 있는지 확인
-if latest_file_path:
+if live_path:
+    result_index = load_live_index(live_path)
+elif latest_file_path:
     # 데이터 로드
-    data = load_data(latest_file_path)
+    result_index = load_index(latest_file_path)
+
+# 검사 시작 직후라 아직 결과가 없으면 잠시 후 다시 확인
+if live_path and len(result_index) == 0:
+    st.info(f"검사 진행 중: {os.path.basename(live_path)} - 첫 결과를 기다리는 중입니다.")
+    time.sleep(LIVE_REFRESH_SECONDS)
+    st.rerun()
 
 # 제목
 st.markdown("<div class='md-title text-center'><i class='material-icons'>assessment</i> URL 상태 모니터링 대시보드</div>", unsafe_allow_html=True)
 
 # 사이드바에 데이터 필터링 및 검색 추가
 with st.sidebar:
-    st.success(f"파일 로드 성공: {os.path.basename(latest_file_path)}")
+    if live_path:
+        st.info(f"검사 진행 중: {os.path.basename(live_path)} ({len(result_index)}행 수신, {LIVE_REFRESH_SECONDS:.0f}초마다 갱신)")
+    else:
+        st.success(f"파일 로드 성공: {os.path.basename(latest_file_path)}")
     st.markdown("<div class='md-subtitle'><i class='material-icons'>filter_list</i>필터</div>", unsafe_allow_html=True)
     
     # URL 상태 필터링 옵션 추가
-    status_options = st.multiselect('상태를 선택하세요:', options=data['status'].unique(), default=data['status'].unique())
-    filtered_data = data[data['status'].isin(status_options)]
+    status_values = sorted(result_index.status_categories)
+    status_options = st.multiselect('상태를 선택하세요:', options=status_values, default=status_values)
 
-    # 검색 기능 추가
+    # 검색 기능 추가 (상태 필터와 함께 인덱스에서 처리)
     search_query = st.text_input('ID 또는 URL 검색:')
-    if search_query:
-        filtered_data = filtered_data[filtered_data['id'].str.contains(search_query) | 
-                                      filtered_data['url'].str.contains(search_query, case=False)]
+    filtered_data = result_index.filter(status_options, search_query)
     st.sidebar.write(f"필터 적용 후 총 데이터 개수: {len(filtered_data)}개")
 # 탭 구성
-tabs = st.tabs(["데이터 필터링", "요약 차트 보기", "이미지 전체 보기", "상태 코드 설명"])
+tabs = st.tabs(["데이터 필터링", "요약 차트 보기", "이미지 전체 보기", "상태 코드 설명", "추이 보기", "변경 사항"])
 
 with tabs[0]:
     st.markdown("<div class='md-subtitle'><i class='material-icons'>filter_list</i> 데이터 필터링</div>", unsafe_allow_html=True)
@@ -175,7 +223,8 @@ with tabs[0]:
                     st.write(f"**Log:** {selected_row['log']}")
 
                     # 스크린샷 경로 가져오기
-                    screenshot_path = filtered_data[(filtered_data['id'] == selected_row['id']) & (filtered_data['url'] == selected_row['url'])]['screenshot'].values[0]
+                    indexed_row = result_index.lookup(selected_row['id'], selected_row['url'])
+                    screenshot_path = indexed_row['screenshot'] if indexed_row is not None else None
 
                     if pd.notnull(screenshot_path) and screenshot_path != '':
                         st.markdown("<div class='md-subtitle'><i class='material-icons'>image</i> 스크린샷:</div>", unsafe_allow_html=True)
@@ -194,8 +243,7 @@ with tabs[1]:
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        status_counts = data['status'].value_counts().reset_index()
-        status_counts.columns = ['status', 'count']
+        status_counts = result_index.status_counts()
 
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -252,7 +300,7 @@ with tabs[1]:
         )
 
         fig.add_annotation(
-            text=f"총 URL 개수: {data.shape[0]}",
+            text=f"총 URL 개수: {len(result_index)}",
             x=0.5,
             y=-0.25,
             showarrow=False,
@@ -264,20 +312,53 @@ with tabs[1]:
 with tabs[2]:
     st.markdown("<div class='md-subtitle'><i class='material-icons'>image</i> 필터별 이미지 전체 보기</div>", unsafe_allow_html=True)
 
-    grouped_data = filtered_data.groupby('id')
-    for id, group in grouped_data:
-        with st.expander(f"ID: {id}", expanded=True):
+    # 유사 스크린샷 클러스터 정보가 있으면 클러스터별 대표 이미지 하나만 표시
+    if 'image_cluster' in filtered_data.columns:
+        clustered_data = filtered_data[filtered_data['image_cluster'] >= 0]
+        grouped_data = [
+            (f"유사 이미지 그룹 {cluster} (ID {group['id'].nunique()}개: {', '.join(map(str, group['id'].unique()[:10]))})",
+             group.head(1))
+            for cluster, group in clustered_data.groupby('image_cluster')
+        ]
+        grouped_data += [(f"ID: {id}", group) for id, group in filtered_data[filtered_data['image_cluster'] < 0].groupby('id')]
+    else:
+        grouped_data = [(f"ID: {id}", group) for id, group in filtered_data.groupby('id')]
+
+    # 페이지 단위로 그룹을 나누어 현재 페이지의 썸네일만 로드
+    page_count = max(1, math.ceil(len(grouped_data) / GALLERY_PAGE_SIZE))
+    page = st.number_input(f"페이지 (전체 {page_count}페이지, 그룹 {len(grouped_data)}개)",
+                           min_value=1, max_value=page_count, value=1, step=1)
+    page_groups = grouped_data[(page - 1) * GALLERY_PAGE_SIZE:page * GALLERY_PAGE_SIZE]
+
+    # 썸네일을 클릭(원본 보기)하면 원본 이미지를 위쪽에 표시
+    selected_image = st.session_state.get('gallery_selected_image')
+    if selected_image:
+        with st.container():
+            st.markdown(f"<div class='md-subtitle'><i class='material-icons'>zoom_in</i> 원본: {selected_image}</div>", unsafe_allow_html=True)
+            try:
+                with open(selected_image, 'rb') as f:
+                    st.image(Image.open(f), use_column_width=True)
+            except (FileNotFoundError, UnidentifiedImageError):
+                st.markdown(f"<div class='md-error'>이미지 로드 실패: {selected_image}</div>", unsafe_allow_html=True)
+            if st.button("닫기", key="gallery_close"):
+                st.session_state['gallery_selected_image'] = None
+                st.rerun()
+
+    for group_index, (label, group) in enumerate(page_groups):
+        with st.expander(label, expanded=True):
             image_paths = group['screenshot'].dropna().unique()
 
             cols = st.columns(3)
             for i, image_path in enumerate(image_paths):
-                try:
-                    image = Image.open(image_path)
-                    with cols[i % 3]:
-                        st.image(image, caption=image_path, use_column_width=True)
-                except (FileNotFoundError, UnidentifiedImageError):
-                    with cols[i % 3]:
+                with cols[i % 3]:
+                    thumbnail_path = thumbnail_cache.get(image_path)
+                    if thumbnail_path is None:
                         st.markdown(f"<div class='md-error'>이미지 로드 실패: {image_path}</div>", unsafe_allow_html=True)
+                        continue
+                    st.image(thumbnail_path, caption=os.path.basename(image_path), use_column_width=True)
+                    if st.button("원본 보기", key=f"gallery_open_{page}_{group_index}_{i}"):
+                        st.session_state['gallery_selected_image'] = image_path
+                        st.rerun()
                         
 with tabs[3]:
     # 상태 코드 정의
@@ -313,3 +394,90 @@ with tabs[3]:
 
     for code, description in status_descriptions.items():
         st.markdown(f"**{code}**: {description}")
+
+with tabs[4]:
+    st.markdown("<div class='md-subtitle'><i class='material-icons'>timeline</i> 실행별 상태 추이</div>", unsafe_allow_html=True)
+
+    if not os.path.exists(history_store.daily_path):
+        st.markdown("이력이 없습니다. `python history_store.py`로 이전 처리 결과를 이력 저장소에 추가하세요.")
+    else:
+        status_trend, uptime_trend = load_history_trends(os.path.getmtime(history_store.daily_path))
+
+        # 날짜별 상태 개수 (누적 막대)
+        fig = go.Figure()
+        for status, group in status_trend.groupby('status'):
+            fig.add_trace(go.Bar(x=group['date'], y=group['count'], name=status))
+        fig.update_layout(
+            title='날짜별 Status 개수',
+            barmode='stack',
+            xaxis_title='Date',
+            yaxis_title='Count',
+            template='plotly_white',
+            height=500
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        # 도메인별 가동률 (검사 건수가 많은 도메인 기본 선택)
+        domain_totals = uptime_trend.groupby('domain')['count'].sum().sort_values(ascending=False)
+        selected_domains = st.multiselect('가동률을 볼 도메인:', options=list(domain_totals.index),
+                                          default=list(domain_totals.index[:5]))
+        fig = go.Figure()
+        for domain, group in uptime_trend[uptime_trend['domain'].isin(selected_domains)].groupby('domain'):
+            fig.add_trace(go.Scatter(x=group['date'], y=group['uptime'] * 100, mode='lines+markers', name=domain))
+        fig.update_layout(
+            title='도메인별 가동률 (OK, REDIRECT 비율)',
+            xaxis_title='Date',
+            yaxis_title='Uptime (%)',
+            yaxis={'range': [0, 105]},
+            template='plotly_white',
+            height=500
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        # URL별 상태 변화
+        history_url = st.text_input('상태 변화를 볼 URL:')
+        if history_url:
+            url_history = history_store.url_history(history_url)
+            if url_history.empty:
+                st.markdown("<div class='md-error'>이력에 없는 URL입니다.</div>", unsafe_allow_html=True)
+            else:
+                fig = go.Figure(go.Scatter(
+                    x=url_history['run_time'], y=url_history['status'],
+                    mode='lines+markers', line={'shape': 'hv'}
+                ))
+                fig.update_layout(title='URL 상태 변화', xaxis_title='Run', yaxis_title='Status',
+                                  template='plotly_white', height=400)
+                st.plotly_chart(fig, use_container_width=True)
+                st.dataframe(url_history, use_container_width=True)
+
+with tabs[5]:
+    st.markdown("<div class='md-subtitle'><i class='material-icons'>compare_arrows</i> 이전 실행 대비 변경 사항</div>", unsafe_allow_html=True)
+
+    change_report_path = find_latest_result('.', prefix=CHANGE_REPORT_PREFIX)
+    if change_report_path is None:
+        st.markdown("변경 보고서가 없습니다. `python change_detection.py`로 최근 두 실행을 비교하세요.")
+    else:
+        change_report = load_change_report(change_report_path, os.path.getmtime(change_report_path))
+        st.markdown(f"보고서: {os.path.basename(change_report_path)}")
+
+        # 변경 유형별 개수
+        change_counts = change_report['change_type'].value_counts()
+        cols = st.columns(max(1, len(change_counts)))
+        for col, (change_type, count) in zip(cols, change_counts.items()):
+            col.metric(change_type, f"{count}개")
+
+        # 변경 유형 필터와 검색 (사이드바 검색어와 같은 방식으로 id/url 부분 일치)
+        change_types = list(change_counts.index)
+        selected_change_types = st.multiselect('변경 유형:', options=change_types, default=change_types)
+        shown_report = change_report[change_report['change_type'].isin(selected_change_types)]
+        if search_query:
+            shown_report = shown_report[
+                shown_report['id'].astype(str).str.contains(search_query, regex=False)
+                | shown_report['url'].astype(str).str.contains(search_query, case=False, regex=False)
+            ]
+        st.dataframe(shown_report, use_container_width=True)
+
+# 진행 중인 검사는 일정 주기로 새 결과를 확인
+if live_path:
+    time.sleep(LIVE_REFRESH_SECONDS)
+    st.rerun()
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 벤치마크용 페이지 유형별 비율
+PAGE_MIX = {
+    'static': 0.35,
+    'js': 0.15,
+    'slow': 0.05,
+    'redirect': 0.1,
+    'missing': 0.1,
+    'error': 0.05,
+    'empty': 0.1,
+    'youtube': 0.1,
+}
+
+SLOW_DELAY = 2.0  # slow 페이지 응답 지연 (초)
+REDIRECT_HOPS = 3  # 리다이렉트 체인 길이
+
+# 렌더링 프로필로 차단할 수 있는 하위 리소스 (확장자: (Content-Type, 크기))
+ASSET_TYPES = {
+    'woff2': ('font/woff2', 80 * 1024),
+    'mp4': ('video/mp4', 512 * 1024),
+    'png': ('image/png', 40 * 1024),
+    'css': ('text/css', 8 * 1024),
+}
+ASSET_DELAY = 0.2  # 하위 리소스 응답 지연 (초)
+
+STATIC_PAGE = (
+    "<html><head><title>static</title>"
+    "<link rel='stylesheet' href='/asset/site.css'>"
+    "<style>@font-face { font-family: bench; src: url('/asset/font.woff2'); } body { font-family: bench; }</style>"
+    "</head><body><header>헤더</header><main>"
+    "<img src='/asset/banner.png'><video src='/asset/clip.mp4' autoplay muted></video>"
+    + "<p>정적 페이지 본문입니다. 링크 검사 벤치마크용 콘텐츠.</p>" * 20
+    + "<a href='/static/1'>next</a></main><footer>푸터</footer></body></html>"
+)
+
+# 로드 후 일정 시간 동안 DOM을 계속 변경하는 페이지
+JS_PAGE = (
+    "<html><head><title>js</title></head><body><div id='root'>로딩 중...</div><script>"
+    "var count = 0;"
+    "var timer = setInterval(function () {"
+    "  var p = document.createElement('p');"
+    "  p.textContent = 'JS로 추가된 문단 ' + count + ' - 벤치마크용 동적 콘텐츠';"
+    "  document.getElementById('root').appendChild(p);"
+    "  if (++count >= 20) { clearInterval(timer); }"
+    "}, 100);"
+    "fetch('/static/data').then(function (r) { return r.text(); });"
+    "</script></body></html>"
+)
+
+EMPTY_PAGE = "<html><head></head><body></body></html>"
+
+# 유튜브 오류 페이지와 같은 문구를 포함한 페이지
+# (유튜브 상태 판정은 youtube.com 호스트에서만 적용되므로 로컬에서는 렌더링 부하만 재현)
+YOUTUBE_PAGE = (
+    "<html><head><title>YouTube</title></head><body><div id='player'>"
+    "<p>Video unavailable</p><p>This video has been removed by the user.</p>"
+    + "<span>추천 동영상</span>" * 30
+    + "</div><script>var ytInitialPlayerResponse = {\"playabilityStatus\": {\"status\": \"LOGIN_REQUIRED\"}};</script>"
+    "</body></html>"
+)
+
+
+# 벤치마크 서버 핸들러
+class BenchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, code, body=b"", headers=None, send_body=True):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _respond(self, send_body):
+        parts = self.path.strip('/').split('/')
+        page_type = parts[0] if parts else 'static'
+
+        if page_type == 'asset':
+            # /asset/<이름>.<확장자>
+            extension = parts[-1].rsplit('.', 1)[-1]
+            content_type, size = ASSET_TYPES.get(extension, ('application/octet-stream', 1024))
+            time.sleep(ASSET_DELAY)
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(b"\0" * size)
+        elif page_type == 'redirect':
+            # /redirect/<id>/<남은 단계>
+            hops = int(parts[2]) if len(parts) > 2 else REDIRECT_HOPS
+            target = f"/redirect/{parts[1]}/{hops - 1}" if hops > 1 else f"/static/{parts[1]}"
+            self._send(302, headers={'Location': target}, send_body=send_body)
+        elif page_type == 'missing':
+            self._send(404, b"<html><body><h1>Not Found</h1></body></html>", send_body=send_body)
+        elif page_type == 'error':
+            self._send(500, b"<html><body><h1>Internal Server Error</h1></body></html>", send_body=send_body)
+        elif page_type == 'slow':
+            time.sleep(SLOW_DELAY)
+            self._send(200, STATIC_PAGE.encode('utf-8'), send_body=send_body)
+        elif page_type == 'js':
+            self._send(200, JS_PAGE.encode('utf-8'), send_body=send_body)
+        elif page_type == 'empty':
+            self._send(200, EMPTY_PAGE.encode('utf-8'), send_body=send_body)
+        elif page_type == 'youtube':
+            self._send(200, YOUTUBE_PAGE.encode('utf-8'), send_body=send_body)
+        else:
+            self._send(200, STATIC_PAGE.encode('utf-8'), send_body=send_body)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 백그라운드 스레드에서 서버 시작 (서버 객체와 기본 URL 반환)
+def start_bench_server(host='127.0.0.1', port=0):
+    server = ThreadingHTTPServer((host, port), BenchHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# 페이지 유형 비율에 따라 URL 목록 생성
+def generate_bench_urls(base_url, num_rows, page_mix=PAGE_MIX, seed=0):
+    rng = random.Random(seed)
+    page_types = list(page_mix.keys())
+    weights = list(page_mix.values())
+    return [f"{base_url}/{page_type}/{i}" for i, page_type in enumerate(rng.choices(page_types, weights, k=num_rows))]
@@ -0,0 +1,201 @@
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+# link_monitoring 모듈 경로 추가
+LINK_MONITORING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring')
+sys.path.insert(0, LINK_MONITORING_DIR)
+
+from bench_server import start_bench_server, generate_bench_urls
+from domain_scheduler import DomainScheduler
+from generate_test_data import generate_workload
+from render_profile import RenderProfile
+from result_files import find_result_files, read_results
+
+# process_data는 가져올 때 현재 디렉토리의 config.ini를 읽고 process.log를 열므로
+# 작업 디렉토리로 이동한 뒤 load_process_data에서 가져옴
+process_data = None
+
+
+# 작업 디렉토리로 이동하고 link_monitoring의 config.ini를 복사한 뒤 process_data 로드
+def load_process_data(work_dir):
+    global process_data
+    os.chdir(work_dir)
+    if not os.path.exists('config.ini'):
+        shutil.copy(os.path.join(LINK_MONITORING_DIR, 'config.ini'), 'config.ini')
+    import process_data as module
+    process_data = module
+    return process_data
+
+
+# 입력 시트 생성
+def write_input_sheet(urls, output_file):
+    df = pd.DataFrame({
+        'id': [f"B{i:06d}" for i in range(len(urls))],
+        'title': '벤치마크',
+        'url': urls,
+        'page_type': [url.split('/')[3] for url in urls],
+        'last_checked': None,
+        'status': None,
+    })
+    df.to_excel(output_file, index=False)
+    return df
+
+
+# 단계별 지표 파일에서 백분위 계산
+def summarize_stages(metrics_file):
+    values = defaultdict(list)
+    if os.path.exists(metrics_file):
+        with open(metrics_file, encoding='utf-8') as f:
+            for line in f:
+                for stage, seconds in json.loads(line)['spans'].items():
+                    values[stage].append(seconds)
+    summary = {}
+    for stage, stage_values in sorted(values.items()):
+        stage_values.sort()
+        summary[stage] = {
+            f"p{pct}": stage_values[max(1, math.ceil(pct / 100 * len(stage_values))) - 1]
+            for pct in (50, 95, 99)
+        }
+    return summary
+
+
+# 최대 메모리 사용량 (MB, 현재 프로세스와 종료된 자식 프로세스)
+def peak_rss_mb():
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return self_rss / 1024, children_rss / 1024
+
+
+# 렌더링 프로필 교체 (Chrome 옵션도 다시 생성, 프로필 비교를 위해 전송량은 항상 측정)
+# name이 없으면 config.ini의 기본 프로필 유지
+def use_render_profile(name=None):
+    if name:
+        process_data.render_profile = RenderProfile.from_config(process_data.config, name)
+    process_data.render_profile.measure_transfer = True
+    process_data.chrome_options = process_data.configure_webdriver()
+
+
+# 부하 테스트 데이터(중복 URL 포함)를 로컬 서버 주소로 생성하여 입력 시트로 저장
+def write_workload_sheet(num_rows, base_url, output_file, seed=0):
+    workload_file = os.path.splitext(output_file)[0] + '.parquet'
+    generate_workload(num_rows, workload_file, seed=seed, base_url=base_url)
+    df = pd.read_parquet(workload_file)
+    df.to_excel(output_file, index=False)
+    return df
+
+
+# 벤치마크 1회 실행 (workload이면 generate_workload의 중복 URL 분포 사용)
+def run_benchmark(num_rows, base_url, work_dir, polite=False, seed=0, workload=False):
+    input_file = os.path.join(work_dir, f"bench_input_{num_rows}.xlsx")
+    if workload:
+        df = write_workload_sheet(num_rows, base_url, input_file, seed)
+    else:
+        df = write_input_sheet(generate_bench_urls(base_url, num_rows, seed=seed), input_file)
+
+    # 실행마다 도메인 상태를 초기화 (이전 실행의 지연 시간, 회로 상태가 다음 실행에 영향을 주지 않도록)
+    # 로컬 서버는 단일 호스트이므로 기본적으로 도메인 요청 제한 해제
+    process_data.domain_policy = process_data.create_domain_policy()
+    if polite:
+        process_data.domain_scheduler = DomainScheduler(
+            process_data.DOMAIN_MAX_CONCURRENCY, process_data.DOMAIN_REQUESTS_PER_SECOND)
+    else:
+        process_data.domain_scheduler = DomainScheduler(process_data.MAX_THREADS, 0)
+
+    metrics_file = os.path.join(work_dir, process_data.METRICS_FILE)
+    if os.path.exists(metrics_file):
+        os.remove(metrics_file)
+
+    start_time = time.perf_counter()
+    process_data.check_links(input_file=input_file)
+    elapsed = time.perf_counter() - start_time
+
+    output_files = find_result_files(work_dir)
+    output_df = read_results(output_files[-1]) if output_files else pd.DataFrame()
+    status_counts = output_df['status'].value_counts().to_dict() if 'status' in output_df else {}
+    rendered = output_df.dropna(subset=['transfer_bytes']) if 'transfer_bytes' in output_df else pd.DataFrame()
+
+    self_rss, children_rss = peak_rss_mb()
+    report = {
+        'profile': process_data.render_profile.name,
+        'rows': num_rows,
+        'unique_urls': df['url'].nunique(),
+        'elapsed_seconds': round(elapsed, 2),
+        'urls_per_second': round(num_rows / elapsed, 2),
+        'peak_rss_mb': round(self_rss, 1),
+        'peak_child_rss_mb': round(children_rss, 1),
+        'stages': summarize_stages(metrics_file),
+        'status_counts': status_counts,
+        'transfer_bytes_per_url': round(rendered['transfer_bytes'].mean(), 1) if len(rendered) else 0.0,
+        'blocked_requests_per_url': round(rendered['blocked_requests'].mean(), 2) if len(rendered) else 0.0,
+        'render_seconds_per_url': round((rendered['page_load_time'] + rendered['page_wait_time']).mean(), 3) if len(rendered) else 0.0,
+    }
+    return report
+
+
+# 결과 출력
+def print_report(report):
+    print(f"\n=== {report['rows']}행 (고유 URL {report['unique_urls']}개, 렌더링 프로필 {report['profile']}) ===")
+    print(f"처리 시간: {report['elapsed_seconds']}초, 처리량: {report['urls_per_second']} URL/초")
+    print(f"최대 메모리: {report['peak_rss_mb']}MB (자식 프로세스 {report['peak_child_rss_mb']}MB)")
+    for stage, stats in report['stages'].items():
+        print(f"  {stage:<20} p50 {stats['p50']:.3f}초  p95 {stats['p95']:.3f}초  p99 {stats['p99']:.3f}초")
+    print(f"상태별 개수: {report['status_counts']}")
+    print(f"URL당 전송 {report['transfer_bytes_per_url'] / 1024:.1f}KB, 차단된 요청 {report['blocked_requests_per_url']}개, "
+          f"로딩+대기 {report['render_seconds_per_url']}초")
+
+
+# 기준 프로필 대비 URL당 절감량 출력
+def print_savings(baseline, report):
+    saved_kb = (baseline['transfer_bytes_per_url'] - report['transfer_bytes_per_url']) / 1024
+    saved_seconds = baseline['render_seconds_per_url'] - report['render_seconds_per_url']
+    print(f"{report['profile']} vs {baseline['profile']} ({report['rows']}행): "
+          f"URL당 전송량 {saved_kb:.1f}KB 절감, 로딩+대기 시간 {saved_seconds:.3f}초 절감")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 서버 기반 링크 검사 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100], help="입력 행 수 (100 ~ 100000)")
+    parser.add_argument('--work-dir', default=None, help="입력/출력 파일을 저장할 디렉토리")
+    parser.add_argument('--polite', action='store_true', help="config.ini의 도메인 요청 제한 유지")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workload', action='store_true',
+                        help="generate_workload로 중복 URL이 섞인 입력 생성 (로컬 서버 주소 사용)")
+    parser.add_argument('--profiles', nargs='+', default=None,
+                        help="비교할 렌더링 프로필 (첫 번째가 기준, 예: full light thumbnail)")
+    parser.add_argument('--json', default=None, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    work_dir = os.path.abspath(args.work_dir or tempfile.mkdtemp(prefix="link_bench_"))
+    os.makedirs(work_dir, exist_ok=True)
+    load_process_data(work_dir)
+
+    server, base_url = start_bench_server()
+    reports = []
+    try:
+        for num_rows in args.rows:
+            baseline = None
+            for profile in args.profiles or [None]:
+                use_render_profile(profile)
+                report = run_benchmark(num_rows, base_url, work_dir, args.polite, args.seed, args.workload)
+                print_report(report)
+                if baseline is None:
+                    baseline = report
+                else:
+                    print_savings(baseline, report)
+                reports.append(report)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# link_monitoring 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring'))
+
+from process_data import probe_http_status, classify_http_response, MAX_THREADS
+from async_checker import check_rows
+
+# 테스트 설정
+num_urls = 2000
+response_delay = 0.02  # 서버 응답 지연 (초)
+
+
+# 로컬 대체 HTTP 서버 핸들러
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, send_body):
+        time.sleep(response_delay)
+        if self.path.startswith('/redirect'):
+            self.send_response(301)
+            self.send_header('Location', '/ok' + self.path[len('/redirect'):])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path.startswith('/missing'):
+            code = 404
+        elif self.path.startswith('/error'):
+            code = 500
+        else:
+            code = 200
+        body = b"<html><body><p>stand-in</p></body></html>"
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 현재 스레드 기반 상태 확인 경로
+def check_row_threaded(row):
+    result = dict(row)
+    response = probe_http_status(row['url'])
+    classify_http_response(
+        result, row['url'], response.status_code,
+        [resp.status_code for resp in response.history],
+        [resp.url for resp in response.history],
+        response.url
+    )
+    return result
+
+
+# 처리량 측정 함수
+def test_throughput():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    paths = ['/ok', '/redirect', '/missing', '/error']
+    rows = [{'id': i, 'url': f"{base_url}{paths[i % len(paths)]}/{i}"} for i in range(num_urls)]
+
+    try:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
+            threaded_results = list(executor.map(check_row_threaded, rows))
+        threaded_elapsed = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        async_results = check_rows(rows, max_in_flight=500, per_host_limit=200)
+        async_elapsed = time.perf_counter() - start_time
+    finally:
+        server.shutdown()
+
+    # 두 경로의 결과 필드가 동일한지 확인
+    fields = ['redirect_codes', 'status', 'log']
+    mismatches = [
+        (threaded[field], asynced[field])
+        for threaded, asynced in zip(threaded_results, async_results)
+        for field in fields
+        if threaded[field] != asynced[field]
+    ]
+
+    print(f"URL 수: {num_urls}")
+    print(f"스레드 기반: {threaded_elapsed:.2f}초 ({num_urls / threaded_elapsed:.1f} URL/초)")
+    print(f"비동기 기반: {async_elapsed:.2f}초 ({num_urls / async_elapsed:.1f} URL/초)")
+    print(f"속도 향상: {threaded_elapsed / async_elapsed:.1f}배")
+    print(f"결과 불일치: {len(mismatches)}건")
+
+    assert not mismatches, f"결과 필드 불일치: {mismatches[:5]}"
+    assert async_elapsed < threaded_elapsed, "비동기 경로가 스레드 기반 경로보다 느립니다."
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    test_throughput()
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pandas as pd
+
+# link_monitoring 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring'))
+
+import process_data
+from result_store import ResultStore
+
+URL = 'https://dynamic.example.com/page'
+
+
+# requests 응답 대용 (ETag/Last-Modified 없는 동적 페이지)
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.history = []
+        self.url = URL
+
+
+# 유지 시간 이내의 정상 결과가 저장된 저장소 (검증 헤더 없음)
+def cached_store(tmp_path):
+    screenshot = tmp_path / 'cached.jpg'
+    screenshot.write_bytes(b'jpeg')
+    store = ResultStore(str(tmp_path / 'results.db'), {process_data.STATUS_OK: 3600})
+    store.put(process_data.generate_hash(URL), URL, {
+        'status': process_data.STATUS_OK, 'log': '정상 응답', 'redirect_codes': '없음',
+        'screenshot': str(screenshot), 'thumbnail': None, 'dhash': 'ffff0000ffff0000',
+        'visible_text_length': 120, 'content_fingerprint': 'abc',
+    })
+    return store
+
+
+def stub_probe(monkeypatch, status_code):
+    probes = []
+
+    def probe(url, timeout=None, headers=None, **kwargs):
+        probes.append(headers)
+        return FakeResponse(status_code)
+
+    monkeypatch.setattr(process_data, 'probe_http_status', probe)
+    return probes
+
+
+def stub_render(monkeypatch):
+    renders = []
+    monkeypatch.setattr(process_data, 'render_link', lambda row, result, *args, **kwargs: renders.append(row['id']))
+    return renders
+
+
+# 검증 헤더가 없어도 유지 시간 이내이고 1단계 결과가 같으면 다시 렌더링하지 않음
+def test_fresh_result_without_validators_is_reused(tmp_path, monkeypatch):
+    store = cached_store(tmp_path)
+    probes = stub_probe(monkeypatch, 200)
+    renders = stub_render(monkeypatch)
+
+    result = process_data.process_link_incremental(pd.Series({'id': 'A1', 'url': URL}), store)
+
+    assert probes == [None]
+    assert renders == []
+    assert result['status'] == process_data.STATUS_OK
+    assert result['screenshot'] == str(tmp_path / 'cached.jpg')
+    assert result['dhash'] == 'ffff0000ffff0000'
+    assert '이전 결과 재사용' in result['log']
+    store.close()
+
+
+# 1단계 결과가 달라지면 재사용하지 않고 새로 검사
+def test_changed_status_without_validators_is_rechecked(tmp_path, monkeypatch):
+    store = cached_store(tmp_path)
+    stub_probe(monkeypatch, 404)
+    renders = stub_render(monkeypatch)
+
+    result = process_data.process_link_incremental(pd.Series({'id': 'A1', 'url': URL}), store)
+
+    assert result['status'] == process_data.STATUS_CLIENT_ERROR
+    assert renders == []
+    assert store.get(process_data.generate_hash(URL))['status'] == process_data.STATUS_CLIENT_ERROR
+    store.close()
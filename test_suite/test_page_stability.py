@@ -0,0 +1,38 @@
+import os
+import sys
+
+# link_monitoring 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring'))
+
+import process_data
+
+
+# 페이지 로드 전략별 문서 준비 조건
+def test_ready_state_condition_follows_page_load_strategy():
+    assert process_data.ready_state_condition('normal') == "document.readyState === 'complete'"
+    assert process_data.ready_state_condition('eager') == "document.readyState !== 'loading'"
+    assert process_data.ready_state_condition('none') == "true"
+
+
+# 안정화 스크립트에 전략별 조건이 들어가고 자리 표시자가 남지 않음
+def test_stability_script_uses_strategy_condition():
+    for strategy in ('normal', 'eager', 'none'):
+        script = process_data.page_stability_script(strategy)
+        assert '__READY_CONDITION__' not in script
+        assert f"({process_data.ready_state_condition(strategy)}) && inflight <= 0" in script
+    assert "readyState === 'complete'" not in process_data.page_stability_script('eager')
+    assert "readyState" not in process_data.page_stability_script('none')
+
+
+# polling 방식도 전략별 조건으로 대기
+def test_polling_wait_uses_strategy_condition(monkeypatch):
+    scripts = []
+
+    class FakeDriver:
+        def execute_script(self, script):
+            scripts.append(script)
+            return True if script.startswith('return document.readyState') or script == 'return true' else 1
+
+    monkeypatch.setattr(process_data.time, 'sleep', lambda seconds: None)
+    process_data.wait_for_page_load_polling(FakeDriver(), timeout=1, stability_threshold=1, page_load_strategy='eager')
+    assert scripts[0] == "return document.readyState !== 'loading'"
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pandas as pd
+
+# link_monitoring 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring'))
+
+from result_index import ResultIndex
+
+
+def sample_index():
+    return ResultIndex(pd.DataFrame({
+        'id': ['A1', 'A2', 'A3'],
+        'url': ['https://a.example.com', 'https://b.example.com', 'https://c.example.com'],
+        'status': ['정상', None, '클라이언트 오류'],
+    }))
+
+
+# 모든 상태를 선택하면 상태 값이 없는(아직 검사하지 않은) 행도 표시
+def test_all_statuses_selected_keeps_rows_without_status():
+    index = sample_index()
+    filtered = index.filter(index.status_categories)
+    assert filtered['id'].tolist() == ['A1', 'A2', 'A3']
+
+
+# 일부 상태만 선택하면 선택한 상태의 행만 표시
+def test_partial_status_selection_filters_rows():
+    index = sample_index()
+    assert index.filter(['정상'])['id'].tolist() == ['A1']
+    assert index.filter(['정상'], 'c.example')['id'].tolist() == []
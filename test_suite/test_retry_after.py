@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+# link_monitoring 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'link_monitoring'))
+
+import process_data
+from domain_scheduler import DomainScheduler
+
+
+# requests 응답 대용 (probe_http_status가 사용하는 속성만)
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.history = []
+        self.url = 'https://rate.example.com/page'
+
+    def close(self):
+        pass
+
+
+# 요청 수를 세고 정해진 응답을 돌려주는 requests.head/get 대용
+def fake_requests(monkeypatch, response):
+    calls = []
+
+    def request(url, **kwargs):
+        calls.append(url)
+        return response
+
+    monkeypatch.setattr(process_data.requests, 'head', request)
+    monkeypatch.setattr(process_data.requests, 'get', request)
+    return calls
+
+
+# 최대값을 넘는 Retry-After는 도메인을 보류하지 않고 429 응답을 그대로 반환
+def test_huge_retry_after_does_not_defer_domain(monkeypatch):
+    scheduler = DomainScheduler(max_concurrency=1, requests_per_second=0)
+    monkeypatch.setattr(process_data, 'domain_scheduler', scheduler)
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    calls = fake_requests(monkeypatch, FakeResponse(429, {'Retry-After': '86400'}))
+
+    response = process_data.probe_http_status('https://rate.example.com/page')
+
+    assert response.status_code == 429
+    assert len(calls) == 2  # HEAD 후 GET 확인, 재시도 없음
+    assert not sleeps
+
+    # 이후 같은 도메인 요청도 대기하지 않음
+    started = time.monotonic()
+    with scheduler.slot(process_data.extract_main_domain('https://rate.example.com/other')):
+        pass
+    assert not sleeps
+    assert time.monotonic() - started < 1
+
+
+# 최대값 이내의 Retry-After는 그만큼만 보류한 뒤 한 번 재시도
+def test_short_retry_after_waits_and_retries_once(monkeypatch):
+    scheduler = DomainScheduler(max_concurrency=1, requests_per_second=0)
+    monkeypatch.setattr(process_data, 'domain_scheduler', scheduler)
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    calls = fake_requests(monkeypatch, FakeResponse(503, {'Retry-After': '1'}))
+
+    response = process_data.probe_http_status('https://rate.example.com/page')
+
+    assert response.status_code == 503
+    assert len(calls) == 4  # 첫 요청(HEAD, GET)과 재시도(HEAD, GET)
+    assert sleeps and max(sleeps) <= process_data.RETRY_AFTER_MAX